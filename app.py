@@ -17,6 +17,7 @@ Features:
 import streamlit as st
 import os
 import gc
+import hashlib
 import numpy as np
 import cv2
 from PIL import Image
@@ -25,9 +26,38 @@ import time
 import requests
 import re
 from urllib.parse import urlparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Tuple, Dict, Any
 import logging
 
+# Optional SIMD-accelerated hashing for the preview cache hot path
+# Falls back to hashlib.blake2b (C implementation) when not installed
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Optional SIMD PNG encoder (pip install fpnge) - 10-20x faster than
+# Pillow's zlib encoder at the cost of slightly larger files, which is the
+# right trade-off for the download buttons where encode time blocks the
+# worker thread
+try:
+    import fpnge
+    FPNGE_AVAILABLE = hasattr(fpnge, 'fromNP')
+except ImportError:
+    FPNGE_AVAILABLE = False
+
+# Optional numba JIT for the multi-megapixel alpha-composite path; the
+# kernel below fuses the blend into one pass with no uint16 intermediates
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -44,78 +74,224 @@ except Exception as e:
 # Import custom image effect utilities from modular packages
 from image_utils.noise import add_gaussian_noise, add_salt_pepper_noise  # Noise generation effects
 from image_utils.blur import apply_gaussian_blur, apply_motion_blur, apply_box_blur  # Blur effects
-from image_utils.shaky import simulate_shaky, simulate_directional_shake  # Camera shake simulation
+from image_utils.shaky import simulate_shaky, simulate_directional_shake, simulate_combined_shake  # Camera shake simulation
 from image_utils.motion import simulate_motion_distortion, simulate_zoom_motion  # Motion effects
 
-# Background removal imports with enhanced error handling and debugging
-# This allows the app to run even if rembg is not installed, with detailed feedback
+# Background removal is loaded lazily the first time the user opens the
+# bg-removal page - importing rembg and probing a model session costs
+# seconds of cold-start time and ~200 MB RSS, which users of the glitch
+# page alone should never pay. The globals below are populated by
+# _ensure_rembg() once the probe has run.
 REMBG_AVAILABLE = False
 REMBG_ERROR_MESSAGE = None
 rembg_remove = None
 new_session = None
 
-# Initialize rembg with session state to prevent repeated logging
-if 'rembg_initialized' not in st.session_state:
-    st.session_state.rembg_initialized = True
-    
+
+@st.cache_resource(show_spinner=False)
+def _probe_rembg():
+    """Import rembg and verify its dependencies without loading a model.
+
+    Earlier versions instantiated a u2net session here just to prove rembg
+    worked, which downloads and loads a 176 MB ONNX file even when the user
+    goes on to pick a different model. The check is now import-only: rembg's
+    functions are importable and onnxruntime exposes InferenceSession. The
+    actually-selected model loads lazily on first use via the cached session
+    loader. Cached with st.cache_resource so the probe runs at most once per
+    process, and only when the background-removal page is actually opened.
+
+    Returns:
+        Tuple of (available, error_message, remove_fn, new_session_fn)
+    """
     try:
         # First, test basic rembg import
         import rembg
         print(f"✅ rembg imported successfully - version: {getattr(rembg, '__version__', 'unknown')}")
-        
+
         # Test specific function imports
-        from rembg import remove as rembg_remove, new_session
+        from rembg import remove as remove_fn, new_session as new_session_fn
         print("✅ rembg functions imported successfully")
-        
-        # Test if we can create a basic session (this is where many deployments fail)
-        try:
-            test_session = new_session('u2net')
-            print("✅ rembg model session test successful")
-            REMBG_AVAILABLE = True
+
+        # Cheap sanity check on the inference backend - no model is loaded
+        import onnxruntime
+        if callable(remove_fn) and callable(new_session_fn) and hasattr(onnxruntime, 'InferenceSession'):
             print("🎉 rembg is fully available and ready")
-        except Exception as session_error:
-            print(f"❌ rembg model session failed: {session_error}")
-            REMBG_ERROR_MESSAGE = f"Model loading failed: {str(session_error)}"
-            # Keep functions available but flag the model issue
-            REMBG_AVAILABLE = False
-            
+            return True, None, remove_fn, new_session_fn
+        return False, "rembg or onnxruntime exposes an unexpected interface", remove_fn, new_session_fn
+
     except ImportError as import_error:
         print(f"❌ rembg import failed: {import_error}")
         # Check for specific dependency issues
         error_str = str(import_error).lower()
         if 'numba' in error_str or 'llvmlite' in error_str:
-            REMBG_ERROR_MESSAGE = f"Python version incompatibility: {str(import_error)} (try Python 3.9)"
+            message = f"Python version incompatibility: {str(import_error)} (try Python 3.9)"
         else:
-            REMBG_ERROR_MESSAGE = f"Import failed: {str(import_error)}"
-        REMBG_AVAILABLE = False
-        rembg_remove = None
-        new_session = None
+            message = f"Import failed: {str(import_error)}"
+        return False, message, None, None
     except Exception as general_error:
         print(f"❌ rembg general error: {general_error}")
-        REMBG_ERROR_MESSAGE = f"General error: {str(general_error)}"
-        REMBG_AVAILABLE = False
-        rembg_remove = None
-        new_session = None
-    
-    # Store the final status in session state
-    if not REMBG_AVAILABLE and REMBG_ERROR_MESSAGE:
-        print(f"❌ rembg is not available: {REMBG_ERROR_MESSAGE}")
-else:
-    # If already initialized, just import silently
-    try:
-        import rembg
-        from rembg import remove as rembg_remove, new_session
-        REMBG_AVAILABLE = True
-        REMBG_ERROR_MESSAGE = None
-    except:
-        REMBG_AVAILABLE = False
-        REMBG_ERROR_MESSAGE = "rembg not available"
-        rembg_remove = None
-        new_session = None
+        return False, f"General error: {str(general_error)}", None, None
+
+
+def _ensure_rembg() -> bool:
+    """Run the cached rembg probe and publish the result to module globals.
+
+    Called at the top of the background-removal page. The sidebar status
+    indicators read st.session_state.rembg_available so they can distinguish
+    'not loaded yet' (None) from a confirmed missing installation (False).
+
+    Returns:
+        True if rembg is fully available, False otherwise
+    """
+    global REMBG_AVAILABLE, REMBG_ERROR_MESSAGE, rembg_remove, new_session
+    REMBG_AVAILABLE, REMBG_ERROR_MESSAGE, rembg_remove, new_session = _probe_rembg()
+    st.session_state.rembg_available = REMBG_AVAILABLE
+    st.session_state.rembg_error = REMBG_ERROR_MESSAGE
+    return REMBG_AVAILABLE
 
 
 os.environ["U2NET_HOME"] = "/tmp/u2net_models"
 
+# Single worker for heavy processing jobs (ONNX inference) so the Streamlit
+# script thread can return immediately and keep the UI responsive; one
+# worker also serializes inference, avoiding thread oversubscription
+_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+
+@lru_cache(maxsize=32)
+def _hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
+    """Convert a '#RRGGBB' hex string to an (r, g, b) tuple of ints.
+
+    Cached because Streamlit re-executes the script on every widget change,
+    so the same color string gets parsed over and over between reruns.
+    """
+    return tuple(int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+
+
+@lru_cache(maxsize=8)
+def _bg_composite_lut(bg_rgb: Tuple[int, int, int]) -> np.ndarray:
+    """Build the 256x3 background-term lookup table for one bg color.
+
+    lut[a] = round(bg_rgb * (255 - a) / 255) for every possible alpha
+    value, so the blend replaces a per-pixel multiply against the
+    background with a single table lookup. Cached per color; users rarely
+    touch more than a handful of background colors in a session.
+    """
+    inv = (255 - np.arange(256, dtype=np.uint16))[:, None]
+    return (inv * np.asarray(bg_rgb, dtype=np.uint16) + 127) // 255
+
+
+# Above this many array elements the NumPy blend's uint16 intermediate is
+# large enough that the fused single-pass numba kernel wins
+_NUMBA_COMPOSITE_MIN_SIZE = 2_000_000
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, cache=True)
+    def _composite_numba(rgba, bg_r, bg_g, bg_b, out):  # pragma: no cover - compiled
+        for y in numba.prange(rgba.shape[0]):
+            for x in range(rgba.shape[1]):
+                a = rgba[y, x, 3]
+                ia = 255 - a
+                out[y, x, 0] = (rgba[y, x, 0] * a + bg_r * ia + 127) // 255
+                out[y, x, 1] = (rgba[y, x, 1] * a + bg_g * ia + 127) // 255
+                out[y, x, 2] = (rgba[y, x, 2] * a + bg_b * ia + 127) // 255
+
+    # Pre-warm on a dummy so the JIT compile (cached on disk afterwards)
+    # is paid at import instead of on the first user image
+    _composite_numba(np.zeros((2, 2, 4), dtype=np.uint8), 255, 255, 255,
+                     np.empty((2, 2, 3), dtype=np.uint8))
+
+
+def _composite_background(rgba: np.ndarray, bg_rgb: Tuple[int, int, int]) -> np.ndarray:
+    """Flatten an RGBA image onto a solid background color.
+
+    Implements result = foreground*alpha + background*(1-alpha) entirely in
+    uint16 integer arithmetic instead of float64. The float version touches
+    roughly 4x the bytes in temporaries, which makes compositing memory-bound
+    on large images; keeping everything in uint16 halves the scratch traffic
+    and lets NumPy's ufuncs vectorize the whole blend.
+
+    Args:
+        rgba: Input image as HxWx4 uint8 numpy array
+        bg_rgb: Background color as an (r, g, b) tuple of 0-255 ints
+
+    Returns:
+        Composited image as HxWx3 uint8 numpy array
+    """
+    # Large images take the fused numba kernel: one pass over the pixels,
+    # no full-size uint16 temporaries
+    if NUMBA_AVAILABLE and rgba.size > _NUMBA_COMPOSITE_MIN_SIZE:
+        h, w = rgba.shape[:2]
+        out = np.empty((h, w, 3), dtype=np.uint8)
+        _composite_numba(np.ascontiguousarray(rgba), bg_rgb[0], bg_rgb[1], bg_rgb[2], out)
+        return out
+
+    # The background term is a pure function of (alpha, bg_rgb), so a 256x3
+    # LUT replaces its per-pixel multiply with a table lookup. +127 rounds
+    # the /255 divisions to nearest; max intermediate is 255*255 + 127,
+    # which fits in uint16, and the two rounded terms sum to at most 255.
+    # The foreground arithmetic writes back into its own buffer via out=
+    # so the blend allocates only the promotion buffer and the LUT gather.
+    fg = rgba[:, :, :3].astype(np.uint16)
+    np.multiply(fg, rgba[:, :, 3:4], out=fg)
+    np.add(fg, 127, out=fg)
+    np.floor_divide(fg, 255, out=fg)
+    np.add(fg, _bg_composite_lut(bg_rgb)[rgba[:, :, 3]], out=fg)
+    return fg.astype(np.uint8)
+
+
+@st.cache_resource(show_spinner=False)
+def _load_rembg_session(model_name: str):
+    """Load and cache an ONNX session for the given rembg model.
+
+    Sessions are cached globally across all users and reruns via
+    st.cache_resource, so switching between models in the UI reuses the
+    already-initialized session instead of paying the 200-500 ms ONNX
+    model init on every toggle.
+
+    Where possible the session is built with tuned onnxruntime options:
+    full graph optimization (constant folding, Conv+BN fusion), a capped
+    intra-op thread count to avoid oversubscribing Streamlit's own
+    threads, and GPU/CoreML providers when the runtime reports them.
+    Falls back to rembg's default session construction otherwise.
+
+    Args:
+        model_name: The name of the rembg model to load
+
+    Returns:
+        A session object for the specified model
+    """
+    kwargs = {}
+    model_path = f"models/{model_name}.onnx"  # Adjust the path if you have pre-bundled models
+    if os.path.exists(model_path):
+        kwargs["path"] = model_path
+
+    try:
+        import onnxruntime as ort
+        from rembg.sessions import sessions_class
+
+        sess_opts = ort.SessionOptions()
+        sess_opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        sess_opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        sess_opts.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+        sess_opts.inter_op_num_threads = 1
+
+        available = ort.get_available_providers()
+        providers = [p for p in ("CUDAExecutionProvider", "CoreMLExecutionProvider")
+                     if p in available]
+        providers.append("CPUExecutionProvider")
+
+        session_class = next((sc for sc in sessions_class if sc.name() == model_name), None)
+        if session_class is not None:
+            return session_class(model_name, sess_opts, providers, **kwargs)
+    except Exception as tuning_error:
+        # rembg internals or onnxruntime API may differ between versions -
+        # a default session is better than no session
+        logger.warning(f"Falling back to default rembg session options: {tuning_error}")
+
+    return new_session(model_name, **kwargs)
+
+
 class BackgroundRemovalManager:
     """Manages background removal functionality with proper error handling and model management.
     
@@ -164,73 +340,79 @@ class BackgroundRemovalManager:
             "size": "~43MB"
         }
     }
-    
+
+    # Models the manual batch path in remove_backgrounds understands: its
+    # hand-rolled preprocessing is the single-mask U2-Net recipe (320x320,
+    # ImageNet mean/std). isnet-general-use expects 1024x1024 with its own
+    # normalization and u2net_cloth_seg emits multi-class masks, so both
+    # must take the per-image rembg fallback even if their exports report
+    # a dynamic batch dimension
+    BATCHABLE_MODELS = frozenset({"u2net", "u2netp", "u2net_human_seg", "silueta"})
+
     def __init__(self):
-        self.sessions = {}
         self.model_loaded = {}
-    
+
     def get_session(self, model_name: str):
         """Get or create a session for the specified model.
-        
-        This method implements lazy loading of AI models - only loading them when
-        needed and caching them for future use. This approach saves memory and
-        reduces startup time.
-        
+
+        This method delegates to the module-level st.cache_resource loader,
+        so each model's ONNX session is initialized at most once per process
+        and shared across reruns and users.
+
         Args:
             model_name: The name of the model to load (must be one of the keys in MODELS)
-            
+
         Returns:
             A session object for the specified model
-            
+
         Raises:
             ImportError: If rembg library is not available
             RuntimeError: If model loading fails for any reason
         """
         if not REMBG_AVAILABLE:
-            raise ImportError("rembg library is not available")
-        
-        # Check if model is already loaded - if not, load it
-        # Unload any previously loaded models to save memory
-        for loaded_model in list(self.sessions.keys()):
-            if loaded_model != model_name:
-                del self.sessions[loaded_model]
+            # Surface the probe's diagnosis rather than a generic message
+            detail = f": {REMBG_ERROR_MESSAGE}" if REMBG_ERROR_MESSAGE else ""
+            raise ImportError(f"rembg library is not available{detail}")
 
         try:
-            # Create a new session for this model
-            model_path = f"models/{model_name}.onnx"  # Adjust the path if you have pre-bundled models
-            if os.path.exists(model_path):
-                self.sessions[model_name] = new_session(model_name=model_name, path=model_path)
-            else:
-                self.sessions[model_name] = new_session(model_name)
+            session = _load_rembg_session(model_name)
             self.model_loaded[model_name] = True
         except Exception as e:
             # Provide detailed error information for troubleshooting
             raise RuntimeError(f"Failed to load model '{model_name}': {str(e)}")
-        
-        return self.sessions[model_name]
+
+        return session
     
-    def remove_background(self, image: np.ndarray, model_name: str = "u2net", 
-                         return_rgba: bool = True, bg_color: str = None) -> np.ndarray:
+    def remove_background(self, image: np.ndarray, model_name: str = "u2net",
+                         return_rgba: bool = True, bg_color: str = None,
+                         max_side: int = 1024) -> np.ndarray:
         """
         Remove background from image using the specified AI model.
-        
+
         This method handles the complete background removal process including:
         - Input validation and preprocessing
+        - Downscaling oversized inputs before inference (the models resize
+          internally anyway, so running post-processing at full resolution
+          only burns CPU time)
         - Model selection and application
         - Output format handling (transparent, white, or custom background)
         - Error handling and reporting
-        
+
         Args:
             image: Input image as numpy array (RGB or RGBA format)
             model_name: Model to use for background removal (must be one of the keys in MODELS)
-            return_rgba: If True, returns RGBA image with transparency; if False, returns RGB 
+            return_rgba: If True, returns RGBA image with transparency; if False, returns RGB
                         with either white or custom background
             bg_color: Optional hex color string for custom background (e.g., "#FF0000" for red)
                      Only used when return_rgba is False
-        
+            max_side: Cap on the longest edge fed into the model. Larger inputs
+                     are downscaled before inference and the resulting alpha
+                     mask is upsampled back to the original resolution.
+                     Callers wanting a fast preview can pass e.g. 512.
+
         Returns:
             Processed image as numpy array (RGBA if return_rgba=True, RGB otherwise)
-            
+
         Raises:
             ImportError: If rembg library is not installed
             RuntimeError: If background removal process fails
@@ -246,42 +428,61 @@ class BackgroundRemovalManager:
             
             # Convert numpy array to PIL Image (required by rembg)
             input_pil = Image.fromarray(image)
-            
+            orig_w, orig_h = input_pil.size
+
+            # Downscale oversized inputs before inference - the U-Net family
+            # resizes to ~320px internally, but alpha matting and
+            # post-processing still run at input resolution
+            scale = min(1.0, max_side / max(input_pil.size))
+            if scale < 1.0:
+                small = input_pil.resize(
+                    (int(orig_w * scale), int(orig_h * scale)), Image.BILINEAR)
+            else:
+                small = input_pil
+
             # Step 2: Get or create model session (lazy loading)
             session = self.get_session(model_name)
-            
+
             # Step 3: Apply background removal using the selected model
-            output_pil = rembg_remove(input_pil, session=session)
-            
+            output_pil = rembg_remove(small, session=session)
+
             # Step 4: Convert result back to numpy array for further processing
             output_array = np.array(output_pil)
+
+            # If we ran the model on a downscaled copy, upsample the alpha
+            # mask back to the original resolution and recombine it with the
+            # full-resolution RGB so output quality matches the input size
+            if scale < 1.0 and output_array.shape[2] == 4:
+                alpha_full = cv2.resize(output_array[:, :, 3], (orig_w, orig_h),
+                                        interpolation=cv2.INTER_LINEAR)
+                # Grayscale uploads (PIL 'L' mode) decode as 2D arrays, so
+                # expand them to RGB before stacking the alpha on top
+                if image.ndim == 3:
+                    rgb_full = image[:, :, :3]
+                else:
+                    rgb_full = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+                output_array = np.dstack([rgb_full, alpha_full])
             
             # Step 5: Handle output format based on user preferences
             if return_rgba:
                 # Option A: Return transparent background (RGBA)
                 if output_array.shape[2] == 3:  # If model returned RGB instead of RGBA
-                    # Add fully opaque alpha channel
-                    alpha = np.ones((output_array.shape[0], output_array.shape[1], 1), dtype=output_array.dtype) * 255
-                    output_array = np.concatenate([output_array, alpha], axis=2)
+                    # Add a fully opaque alpha channel via a single contiguous
+                    # allocation (np.concatenate would build a temporary
+                    # ones-array and then reallocate the whole image)
+                    h, w = output_array.shape[:2]
+                    rgba = np.empty((h, w, 4), dtype=output_array.dtype)
+                    rgba[:, :, :3] = output_array
+                    rgba[:, :, 3] = 255
+                    output_array = rgba
             elif bg_color:  # Custom background color
                 # Option B: Return RGB with custom background color
                 if output_array.shape[2] == 4:  # If we have alpha channel
-                    # Convert hex color string to RGB tuple
-                    bg_rgb = tuple(int(bg_color[i:i+2], 16) for i in (1, 3, 5))
-                    
-                    # Alpha blending formula: result = foreground*alpha + background*(1-alpha)
-                    alpha = output_array[:, :, 3:4] / 255.0  # Normalize alpha to 0-1 range
-                    rgb = output_array[:, :, :3]  # Get RGB channels
-                    custom_bg = np.ones_like(rgb) * np.array(bg_rgb)  # Create background color array
-                    output_array = (rgb * alpha + custom_bg * (1 - alpha)).astype(np.uint8)  # Blend
+                    output_array = _composite_background(output_array, _hex_to_rgb(bg_color))
             else:
                 # Option C: Return RGB with white background (default fallback)
                 if output_array.shape[2] == 4:  # If we have alpha channel
-                    # Alpha blending with white background
-                    alpha = output_array[:, :, 3:4] / 255.0
-                    rgb = output_array[:, :, :3]
-                    white_bg = np.ones_like(rgb) * 255  # White background (all 255s)
-                    output_array = (rgb * alpha + white_bg * (1 - alpha)).astype(np.uint8)
+                    output_array = _composite_background(output_array, (255, 255, 255))
                 
             return output_array
             
@@ -289,6 +490,95 @@ class BackgroundRemovalManager:
             # Provide detailed error information for troubleshooting
             raise RuntimeError(f"Background removal failed: {str(e)}")
     
+    def remove_backgrounds(self, images: list, model_name: str = "u2net",
+                           return_rgba: bool = True, bg_color: str = None) -> list:
+        """Remove backgrounds from several images with one batched ONNX forward.
+
+        rembg's wrapper runs the model at batch size 1, which leaves BLAS
+        parallelism on the table when multiple images are pending. This method
+        stacks all inputs into a single NCHW tensor and runs the underlying
+        onnxruntime session once, then post-processes the masks per image.
+
+        Batching requires the model's batch dimension to be dynamic (true for
+        the U2-Net family); if it is fixed, or there is only one image, this
+        falls back to sequential remove_background calls.
+
+        Args:
+            images: List of input images as numpy arrays (RGB or RGBA format)
+            model_name: Model to use (must be one of the keys in MODELS)
+            return_rgba: If True, returns RGBA images with transparency
+            bg_color: Optional hex color string for custom background
+
+        Returns:
+            List of processed images, in the same order as the inputs
+
+        Raises:
+            ImportError: If rembg library is not installed
+            RuntimeError: If background removal process fails
+        """
+        if not REMBG_AVAILABLE:
+            raise ImportError("rembg library is not installed - please install with 'pip install rembg'")
+
+        session = self.get_session(model_name)
+        inner = getattr(session, 'inner_session', None)
+
+        # Only batch when the ONNX input's batch dim is dynamic AND the
+        # model takes the U2-Net preprocessing hardcoded below
+        can_batch = False
+        if (inner is not None and len(images) > 1
+                and model_name in self.BATCHABLE_MODELS):
+            batch_dim = inner.get_inputs()[0].shape[0]
+            can_batch = not isinstance(batch_dim, int)
+
+        if not can_batch:
+            return [self.remove_background(image, model_name=model_name,
+                                           return_rgba=return_rgba, bg_color=bg_color)
+                    for image in images]
+
+        try:
+            # U2-Net family preprocessing: 320x320, ImageNet mean/std
+            target = 320
+            norm_mean = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+            norm_std = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+            prepared = []
+            batch = np.empty((len(images), 3, target, target), dtype=np.float32)
+            for i, image in enumerate(images):
+                if image.dtype != np.uint8:
+                    image = (image * 255).astype(np.uint8)
+                rgb = image[:, :, :3]
+                prepared.append(rgb)
+                small = cv2.resize(rgb, (target, target), interpolation=cv2.INTER_AREA)
+                normalized = (small.astype(np.float32) / 255.0 - norm_mean) / norm_std
+                batch[i] = normalized.transpose(2, 0, 1)
+
+            input_name = inner.get_inputs()[0].name
+            preds = inner.run(None, {input_name: batch})[0]
+
+            results = []
+            for rgb, pred in zip(prepared, preds):
+                # Normalize the raw prediction to a 0-255 alpha mask at the
+                # original resolution (same post-processing rembg applies)
+                mask = pred[0]
+                span = float(mask.max() - mask.min())
+                mask = (mask - mask.min()) / span if span > 0 else np.zeros_like(mask)
+                h, w = rgb.shape[:2]
+                alpha = cv2.resize((mask * 255).astype(np.uint8), (w, h),
+                                   interpolation=cv2.INTER_LINEAR)
+                rgba = np.dstack([rgb, alpha])
+
+                if return_rgba:
+                    results.append(rgba)
+                elif bg_color:
+                    results.append(_composite_background(rgba, _hex_to_rgb(bg_color)))
+                else:
+                    results.append(_composite_background(rgba, (255, 255, 255)))
+            return results
+
+        except Exception as e:
+            # Provide detailed error information for troubleshooting
+            raise RuntimeError(f"Batched background removal failed: {str(e)}")
+
     def is_model_loaded(self, model_name: str) -> bool:
         """Check if a model is already loaded."""
         return self.model_loaded.get(model_name, False)
@@ -298,6 +588,29 @@ class BackgroundRemovalManager:
         return self.MODELS.get(model_name, {})
 
 
+# UI constants derived from the model registry, built once at import time so
+# the render function doesn't rebuild lists/dicts on every rerun
+_MODEL_KEYS = tuple(BackgroundRemovalManager.MODELS.keys())
+_MODEL_LABELS = tuple(BackgroundRemovalManager.MODELS[m]['name'] for m in _MODEL_KEYS)
+_OUTPUT_FORMAT_LABELS = {
+    "transparent": "🔳 Transparent (RGBA)",
+    "white": "⬜ White Background",
+    "custom": "🎨 Custom Color"
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_bg_manager() -> BackgroundRemovalManager:
+    """Return the process-wide BackgroundRemovalManager singleton.
+
+    One manager per Streamlit session would mean each browser tab holds its
+    own model bookkeeping; cache_resource shares a single instance (and,
+    together with the cached session loader, the ONNX sessions themselves)
+    across all sessions in the process.
+    """
+    return BackgroundRemovalManager()
+
+
 class PreviewManager:
     """
     Manages different preview quality modes and image optimization for efficient UI rendering.
@@ -367,28 +680,106 @@ class PreviewManager:
             new_w = max_size
             new_h = int(h * (max_size / w))
         
-        # Use high-quality Lanczos resampling for better visual quality
-        pil_image = Image.fromarray(image)
-        resized = pil_image.resize((new_w, new_h), Image.Resampling.LANCZOS)
-        return np.array(resized)
+        # INTER_AREA is the best-quality OpenCV filter for downscaling and is
+        # SIMD-vectorized, unlike the PIL round-trip (fromarray -> resize ->
+        # np.array) which allocates two extra full-image copies
+        return cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+
+def _resized_preview(image: np.ndarray, image_hash: int, preview_mode: str) -> np.ndarray:
+    """Return the preview-sized copy of the source image, memoized in
+    session state per (image, quality mode).
+
+    Both the effect chain and the display widgets want the same downscaled
+    frame; memoizing it means effect-only changes skip the resize and the
+    browser is never sent the full-resolution array during preview.
+    """
+    key = (image_hash, preview_mode)
+    if st.session_state.get('glitch_resized_key') != key:
+        st.session_state.glitch_resized_preview = PreviewManager.resize_for_preview(
+            image, preview_mode)
+        st.session_state.glitch_resized_key = key
+    return st.session_state.glitch_resized_preview
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _decode_image_bytes(data: bytes) -> np.ndarray:
+    """Decode raw image bytes into a numpy array, cached on the byte content.
+
+    Streamlit reruns the whole script on every widget interaction, so without
+    caching the uploaded file is re-decoded on every slider drag. Keying on
+    the raw bytes means identical uploads (or the same upload across reruns)
+    hit the cache instead of libjpeg/libpng.
+
+    The result is always contiguous uint8, so downstream dtype guards never
+    fire for decoded images. np.asarray shares PIL's pixel buffer where
+    possible instead of copying it like np.array does.
+    """
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    arr = np.asarray(img)
+    if arr.dtype != np.uint8:
+        arr = np.clip(arr, 0, 255).astype(np.uint8)
+    return np.ascontiguousarray(arr)
+
+
+# Shared HTTP session for URL image fetches - keep-alive and connection
+# pooling make repeated fetches from the same host noticeably faster
+_HTTP = requests.Session()
+_HTTP.mount('http://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_HTTP.mount('https://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Refuse to download images larger than this - an unbounded requests.get
+# would buffer the whole body and can blow out the Streamlit worker
+MAX_DOWNLOAD_BYTES = 25 * 1024 * 1024
+
+# URL validation helpers, hoisted to module scope - is_valid_url runs on
+# every keystroke in the URL input, so the pattern is compiled once
+_URL_RE = re.compile(
+    r'^https?://'
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?))'
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp')
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=8)
+def _fetch_url_bytes(url: str) -> bytes:
+    """Fetch raw image bytes from a URL, cached for an hour.
+
+    Streams the body in chunks with a size cap so oversized downloads are
+    rejected early (via Content-Length when present, or as soon as the
+    stream exceeds the limit otherwise).
+    """
+    with _HTTP.get(url, stream=True, timeout=(3, 10)) as response:
+        response.raise_for_status()
+
+        content_length = int(response.headers.get('Content-Length', 0))
+        if content_length > MAX_DOWNLOAD_BYTES:
+            raise ValueError(
+                f"Image is too large ({content_length / (1024 * 1024):.1f} MB, "
+                f"limit {MAX_DOWNLOAD_BYTES // (1024 * 1024)} MB)")
+
+        buf = io.BytesIO()
+        for chunk in response.iter_content(65536):
+            buf.write(chunk)
+            if buf.tell() > MAX_DOWNLOAD_BYTES:
+                raise ValueError(
+                    f"Image is too large (limit {MAX_DOWNLOAD_BYTES // (1024 * 1024)} MB)")
+        return buf.getvalue()
 
 
 def load_image(uploaded_file):
     """Load and convert uploaded file to numpy array."""
-    image = Image.open(uploaded_file)
-    image_array = np.array(image)
-    return image_array
+    return _decode_image_bytes(uploaded_file.getvalue())
 
 
 def load_image_from_url(url):
-    """Load an image from a URL."""
+    """Load an image from a URL as a numpy array."""
     try:
         if not urlparse(url).scheme:
             raise ValueError("Missing scheme in URL. Perhaps you meant to add 'https://'")
 
-        response = requests.get(url)
-        response.raise_for_status()
-        return Image.open(io.BytesIO(response.content))
+        return _decode_image_bytes(_fetch_url_bytes(url))
     except requests.exceptions.RequestException as e:
         raise ValueError(f"Failed to fetch image from URL: {e}")
     except Exception as e:
@@ -417,16 +808,11 @@ def is_valid_url(url):
             return False
         
         # Check for valid image extensions in the path
-        if not parsed.path or not parsed.path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp')):
+        if not parsed.path or not parsed.path.lower().endswith(_IMAGE_EXTENSIONS):
             return False
-        
+
         # Additional regex validation for URL structure
-        regex = re.compile(
-            r'^https?://'
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?))'
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        
-        return bool(regex.match(url))
+        return bool(_URL_RE.match(url))
         
     except Exception:
         return False
@@ -437,15 +823,23 @@ def image_to_bytes(image_array, format='PNG'):
     # Ensure the image is in the correct format for PIL
     if image_array.dtype != np.uint8:
         image_array = np.clip(image_array, 0, 255).astype(np.uint8)
-    
+
+    # Fast path: fpnge encodes 3/4-channel uint8 PNGs an order of magnitude
+    # faster than Pillow's zlib encoder (files come out slightly larger)
+    if (FPNGE_AVAILABLE and format.upper() == 'PNG'
+            and len(image_array.shape) == 3 and image_array.shape[2] in (3, 4)):
+        return fpnge.fromNP(np.ascontiguousarray(image_array))
+
     # Handle different image formats and ensure RGB for JPEG
     if len(image_array.shape) == 2:  # Grayscale image
         image_pil = Image.fromarray(image_array, mode='L')
     elif image_array.shape[2] == 4 and format.upper() == 'JPEG':  # RGBA image for JPEG
-        # JPEG doesn't support alpha channel, convert to RGB
-        image_pil = Image.fromarray(image_array).convert('RGB')
+        # JPEG doesn't support alpha - composite onto white with the
+        # vectorized integer blend instead of PIL's scalar convert('RGB')
+        image_pil = Image.fromarray(_composite_background(image_array, (255, 255, 255)))
     else:  # RGB or RGBA image
-        image_pil = Image.fromarray(image_array)
+        # fromarray is cheaper on C-contiguous input (no internal copy)
+        image_pil = Image.fromarray(np.ascontiguousarray(image_array))
     
     # Save to buffer with high quality for JPEG
     buf = io.BytesIO()
@@ -457,6 +851,161 @@ def image_to_bytes(image_array, format='PNG'):
     return buf.getvalue()
 
 
+# Cap on entries in the per-session preview caches. Entries are encoded
+# PNG bytes, so worst-case memory per session stays in the low MBs instead
+# of growing by a full-resolution array per effect permutation.
+PREVIEW_CACHE_MAX_ENTRIES = 8
+
+# Cap on raw-array entries in the glitch page's live preview cache; preview
+# arrays are small (max 800px edge) so a deeper history is affordable
+GLITCH_PREVIEW_CACHE_MAX_ENTRIES = 16
+
+# Minimum seconds between live preview computes. Dragging a slider fires a
+# rerun on every tick; the debounce defers intermediate ticks so only the
+# settled value pays for a full effect pass
+GLITCH_PREVIEW_DEBOUNCE_S = 0.12
+
+
+def _preview_cache_put(cache: "OrderedDict[Any, bytes]", key: Any, image: np.ndarray) -> bytes:
+    """Store a preview image in an LRU-bounded cache as encoded PNG bytes.
+
+    Storing bytes rather than numpy arrays both bounds memory (PNG is much
+    smaller than a raw array) and lets st.image skip re-encoding the preview
+    on every redraw. Evicts the least-recently-used entries beyond
+    PREVIEW_CACHE_MAX_ENTRIES.
+
+    Args:
+        cache: The OrderedDict cache held in session state
+        key: Hashable cache key identifying the preview content
+        image: Preview image as uint8 numpy array
+
+    Returns:
+        The encoded PNG bytes that were stored
+    """
+    encoded = image_to_bytes(image, 'PNG')
+    cache[key] = encoded
+    cache.move_to_end(key)
+    while len(cache) > PREVIEW_CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+    return encoded
+
+
+def _preview_cache_get(cache: "OrderedDict[Any, bytes]", key: Any):
+    """Fetch encoded preview bytes from the cache, refreshing LRU order.
+
+    Returns None on a miss so callers can encode and store via
+    _preview_cache_put.
+    """
+    encoded = cache.get(key)
+    if encoded is not None:
+        cache.move_to_end(key)
+    return encoded
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _encode_image_cached(img_bytes: bytes, shape: Tuple, dtype: str, fmt: str) -> bytes:
+    """Encode raw image content for download, memoized on the content itself.
+
+    The download sections materialize PNG/JPEG buffers on every rerun even
+    when nothing changed; keying the encode on the underlying bytes makes
+    repeat reruns cache hits.
+    """
+    arr = np.frombuffer(img_bytes, dtype=np.dtype(dtype)).reshape(shape)
+    return image_to_bytes(arr, fmt)
+
+
+def encode_for_download(image: np.ndarray, fmt: str = 'PNG') -> bytes:
+    """Convert an image to encoded bytes for a download button, with caching."""
+    return _encode_image_cached(image.tobytes(), image.shape, str(image.dtype), fmt)
+
+
+def _downloads_for(image: np.ndarray, state_key: str, want_jpeg: bool = True):
+    """Materialize the (png, jpeg) download buffers for an image, per rerun.
+
+    The download sections run on every rerun whether or not the user ever
+    clicks a button, and even a cache hit in encode_for_download pays a full
+    tobytes() copy to build the key. Keep the encoded buffers in session
+    state keyed on the image's object identity so unrelated reruns skip the
+    encode path entirely (the image stays alive in session state, so its id
+    is stable for the lifetime of the entry).
+
+    Args:
+        image: The image to encode
+        state_key: Session-state slot for this download section
+        want_jpeg: Whether a JPEG buffer is needed (False for transparent output)
+
+    Returns:
+        Tuple of (png_bytes, jpeg_bytes_or_None)
+    """
+    key = (id(image), want_jpeg)
+    cached = st.session_state.get(state_key)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    png = encode_for_download(image, 'PNG')
+    jpg = encode_for_download(image, 'JPEG') if want_jpeg else None
+    st.session_state[state_key] = (key, (png, jpg))
+    return png, jpg
+
+
+def _quantize(value: float, step: float) -> float:
+    """Snap a continuous slider value to the nearest multiple of step.
+
+    Streamlit's float sliders emit ~100 distinct positions across their
+    range; snapping to a coarser grid makes consecutive drag positions
+    cache-equal without a visible change in the effect.
+    """
+    return round(round(value / step) * step, 6)
+
+
+# Effect dispatch table in processing order (noise -> blur -> shake ->
+# motion). Each entry maps the effect's key in the effects dict to its
+# image_utils function and the (kwarg, params-key) pairs it takes
+_EFFECT_PIPELINE = (
+    ('gaussian_noise', add_gaussian_noise, (('var', 'variance'),)),
+    ('salt_pepper_noise', add_salt_pepper_noise, (('amount', 'amount'),)),
+    ('gaussian_blur', apply_gaussian_blur, (('kernel_size', 'kernel_size'),)),
+    ('motion_blur', apply_motion_blur, (('degree', 'degree'), ('angle', 'angle'))),
+    ('box_blur', apply_box_blur, (('kernel_size', 'kernel_size'),)),
+    ('camera_shake', simulate_shaky, (('intensity', 'intensity'),)),
+    ('directional_shake', simulate_directional_shake,
+     (('direction', 'direction'), ('intensity', 'intensity'))),
+    ('motion_distortion', simulate_motion_distortion,
+     (('direction', 'direction'), ('intensity', 'intensity'))),
+    ('zoom_motion', simulate_zoom_motion, (('intensity', 'intensity'),)),
+)
+
+_EFFECT_FNS = {name: fn for name, fn, _ in _EFFECT_PIPELINE}
+
+# Fused stage for when both shakes are enabled - translations compose, so
+# one warp replaces two full-frame passes (see simulate_combined_shake)
+_EFFECT_FNS['combined_shake'] = simulate_combined_shake
+
+
+# Stage outputs above this many array elements bypass the memoized adapter.
+# Cache entries are pickled full copies held process-wide, so full-quality
+# runs on large images would pin hundreds of MB across 64 entries; preview
+# frames (800px long edge at most) stay far below this
+_CACHEABLE_STAGE_MAX_SIZE = 4_000_000
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_effect(op_name: str, img_bytes: bytes, shape: Tuple, params: Tuple) -> np.ndarray:
+    """Apply one effect, memoized on the image content and its parameters.
+
+    Keyed on the raw pixel bytes plus the parameter tuple, so dragging a
+    slider back to a previous position - or toggling an unrelated effect -
+    serves each unchanged stage from the LRU instead of re-running the
+    OpenCV kernel. max_entries bounds the cache at 64 stage outputs.
+
+    Stochastic effects (noise, shake) are intentionally frozen per key:
+    identical inputs reproduce the identical preview, matching what the
+    page-level preview cache already guarantees.
+    """
+    image = np.frombuffer(img_bytes, dtype=np.uint8).reshape(shape)
+    return _EFFECT_FNS[op_name](image, **dict(params))
+
+
 def apply_imageglitch_effects(image: np.ndarray, effects: Dict[str, Any]) -> np.ndarray:
     """
     Apply multiple image manipulation effects based on user-selected parameters.
@@ -465,11 +1014,11 @@ def apply_imageglitch_effects(image: np.ndarray, effects: Dict[str, Any]) -> np.
     applying various effects in a specific order to create complex image manipulations.
     It handles multiple effect categories including noise, blur, shake, and motion effects,
     each with their own parameters controlled through the effects dictionary.
-    
-    The processing pipeline maintains image data as float32 throughout to prevent
-    clipping and data loss between effect applications, ensuring high-quality results
-    even with multiple stacked effects.
-    
+
+    The processing pipeline keeps the image in its input dtype (normally uint8)
+    end to end; each effect preserves the dtype it receives, so no intermediate
+    float32 promotion copies are made between steps.
+
     Args:
         image: Input image as numpy array (uint8 or float32)
         effects: Dictionary containing effect parameters with the following structure:
@@ -479,125 +1028,116 @@ def apply_imageglitch_effects(image: np.ndarray, effects: Dict[str, Any]) -> np.
                 or zoom_motion
     
     Returns:
-        Processed image as float32 numpy array with all enabled effects applied
-    
+        Processed image as uint8 numpy array with all enabled effects applied
+
     Note:
         Effects are applied in a specific order: noise → blur → shake → motion
         This order produces the most natural-looking results when combining effects
+
+        Single-effect calls (the common "tweak one slider" interaction) run
+        the one OpenCV kernel directly on the uint8 input - no float
+        promotion on entry and no clip/cast copy on exit
     """
-    # Make a deep copy to avoid modifying the original
-    # Ensure we're working with a float array for processing to avoid clipping during operations
-    result = image.copy().astype(np.float32)
-    
-    # Apply noise effects
-    if effects.get('gaussian_noise', {}).get('enabled', False):
-        noise_params = effects['gaussian_noise']
-        result = add_gaussian_noise(result, var=noise_params['variance'])
-        # Ensure we maintain float32 for further processing
-        result = result.astype(np.float32)
-    
-    if effects.get('salt_pepper_noise', {}).get('enabled', False):
-        noise_params = effects['salt_pepper_noise']
-        result = add_salt_pepper_noise(result, amount=noise_params['amount'])
-        # Ensure we maintain float32 for further processing
-        result = result.astype(np.float32)
-    
-    # Apply blur effects
-    if effects.get('gaussian_blur', {}).get('enabled', False):
-        blur_params = effects['gaussian_blur']
-        result = apply_gaussian_blur(result, kernel_size=blur_params['kernel_size'])
-        # Ensure we maintain float32 for further processing
-        result = result.astype(np.float32)
-    
-    if effects.get('motion_blur', {}).get('enabled', False):
-        blur_params = effects['motion_blur']
-        result = apply_motion_blur(result, degree=blur_params['degree'], angle=blur_params['angle'])
-        # Ensure we maintain float32 for further processing
-        result = result.astype(np.float32)
-    
-    if effects.get('box_blur', {}).get('enabled', False):
-        blur_params = effects['box_blur']
-        result = apply_box_blur(result, kernel_size=blur_params['kernel_size'])
-        # Ensure we maintain float32 for further processing
-        result = result.astype(np.float32)
-    
-    # Apply shake effects
-    if effects.get('camera_shake', {}).get('enabled', False):
-        shake_params = effects['camera_shake']
-        result = simulate_shaky(result, intensity=shake_params['intensity'])
-        # Ensure we maintain float32 for further processing
-        result = result.astype(np.float32)
-    
-    if effects.get('directional_shake', {}).get('enabled', False):
-        shake_params = effects['directional_shake']
-        result = simulate_directional_shake(result, direction=shake_params['direction'], intensity=shake_params['intensity'])
-        # Ensure we maintain float32 for further processing
-        result = result.astype(np.float32)
-    
-    # Apply motion effects
-    if effects.get('motion_distortion', {}).get('enabled', False):
-        motion_params = effects['motion_distortion']
-        result = simulate_motion_distortion(result, direction=motion_params['direction'], intensity=motion_params['intensity'])
-        # Ensure we maintain float32 for further processing
-        result = result.astype(np.float32)
-    
-    if effects.get('zoom_motion', {}).get('enabled', False):
-        motion_params = effects['zoom_motion']
-        result = simulate_zoom_motion(result, intensity=motion_params['intensity'])
-        # Ensure we maintain float32 for further processing
-        result = result.astype(np.float32)
-    
-    # Ensure the result is in the correct format for display and export
-    # Clip values to valid range and convert to uint8
-    result = np.clip(result, 0, 255).astype(np.uint8)
-    
+    # Nothing enabled is the common case on initial load - return the input
+    # untouched instead of paying for any copies or dtype checks
+    if not any(params.get('enabled', False) for params in effects.values()):
+        return image
+
+    # Collect the enabled stages in pipeline order
+    stages = []
+    for name, fn, param_map in _EFFECT_PIPELINE:
+        stage = effects.get(name)
+        if not stage or not stage.get('enabled', False):
+            continue
+        stages.append((name, fn, tuple((kwarg, stage[key]) for kwarg, key in param_map)))
+
+    # Fuse the adjacent shake warps: both are pure translations, so when
+    # both are enabled a single warp with the summed offsets replaces two
+    # full-frame passes
+    for i in range(len(stages) - 1):
+        if stages[i][0] == 'camera_shake' and stages[i + 1][0] == 'directional_shake':
+            params = stages[i][2] + tuple(
+                ('directional_' + kw if kw == 'intensity' else kw, value)
+                for kw, value in stages[i + 1][2])
+            stages[i:i + 2] = [('combined_shake', simulate_combined_shake, params)]
+            break
+
+    # Each enabled stage goes through the memoized adapter; unchanged stages
+    # hit the cache and the input array is never mutated. Only uint8 frames
+    # up to the size cap take the cached path - the adapter reconstructs
+    # arrays as uint8, and caching full-resolution stage outputs would
+    # retain them process-wide. Full-quality runs call the effects directly
+    result = image
+    cacheable = image.dtype == np.uint8 and image.size <= _CACHEABLE_STAGE_MAX_SIZE
+    for name, fn, params in stages:
+        if cacheable:
+            result = _cached_effect(name, result.tobytes(), result.shape, params)
+        else:
+            result = fn(result, **dict(params))
+
+    # Ensure the result is in the correct format for display and export;
+    # with a uint8 input this is already the case and no copy is made.
+    # The saturating cv2.add does the clamp and cast in one SIMD pass
+    # (np.clip + astype is two); convertScaleAbs would be wrong here
+    # since it folds noise undershoot to its absolute value instead of 0
+    if result.dtype != np.uint8:
+        result = cv2.add(result, 0, dtype=cv2.CV_8U)
+
     return result
 
 
-def hash_effects(effects: Dict[str, Any]) -> str:
-    """
-    Create a unique hash string from the effects dictionary for caching purposes.
-    
-    This function generates a consistent, unique identifier for a specific combination
-    of image effects and their parameters. The hash is used as a key in the preview cache
-    system to avoid redundant processing of identical effect combinations.
-    
-    The function works by:
-    1. Converting the effects dictionary to a sorted string representation
-    2. Generating an MD5 hash of this string
-    3. Returning the hexadecimal digest as a unique identifier
-    
-    Args:
-        effects: Dictionary containing effect parameters with structure:
-                {effect_name: {"enabled": bool, param1: value1, param2: value2, ...}}
-    
-    Returns:
-        A 32-character hexadecimal string uniquely identifying the effects combination
-    
-    Note:
-        This function is critical for the caching system that improves UI responsiveness
-        by avoiding redundant processing of identical effect combinations.
-    """
-    import hashlib
-    effect_str = str(sorted(effects.items()))
-    return hashlib.md5(effect_str.encode()).hexdigest()
+def _array_content_hash(arr: np.ndarray) -> int:
+    """Hash an array's raw bytes into an integer identity for cache keys."""
+    data = arr.tobytes()
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
 
 
 def initialize_session_state():
     """
     Initialize Streamlit session state variables for persistent storage across reruns.
     
-    This function sets up two critical session state variables:
-    - bg_manager: Stores the BackgroundRemovalManager instance for AI model management
-    - preview_cache: Dictionary to store processed image previews to avoid redundant processing
+    This function sets up the critical session state variables:
+    - rembg_available: Tri-state availability flag for the lazy rembg probe
+    - preview_cache: LRU-bounded mapping of effects-hash to encoded preview
+      bytes, to avoid redundant processing without unbounded memory growth
     
     The function checks if these variables already exist before initializing them to
     prevent resetting values on Streamlit reruns.
     """
-    if 'bg_manager' not in st.session_state:
-        st.session_state.bg_manager = BackgroundRemovalManager() if REMBG_AVAILABLE else None
+    if 'rembg_available' not in st.session_state:
+        # None means the lazy probe hasn't run yet (vs. False: confirmed missing)
+        st.session_state.rembg_available = None
+        st.session_state.rembg_error = None
     if 'preview_cache' not in st.session_state:
-        st.session_state.preview_cache = {}
+        st.session_state.preview_cache = OrderedDict()
+
+
+def _get_composited_bg_image() -> np.ndarray:
+    """Return the stored processed image with its custom background applied.
+
+    The display and download sections both need the custom-background
+    composite of st.session_state.bg_processed_image, and they run on every
+    rerun. Cache the blended result in session state keyed on the processing
+    generation and chosen color, so unrelated widget interactions reuse it
+    instead of redoing an O(H*W) blend.
+
+    Returns:
+        The composited RGB image, or the processed image unchanged when no
+        custom background applies
+    """
+    processed = st.session_state.bg_processed_image
+    if (st.session_state.get('bg_output_format') != "custom"
+            or 'bg_rgb' not in st.session_state
+            or processed.shape[2] != 4):
+        return processed
+
+    key = (st.session_state.get('bg_generation', 0), st.session_state.bg_rgb)
+    if st.session_state.get('bg_composited_key') != key:
+        st.session_state.bg_composited = _composite_background(processed, st.session_state.bg_rgb)
+        st.session_state.bg_composited_key = key
+    return st.session_state.bg_composited
 
 
 def show_bg_removal_page():
@@ -616,11 +1156,22 @@ def show_bg_removal_page():
     
     The function also manages the processing workflow and error handling.
     """
+    # Bind the hot Streamlit handles once per rerun - these functions make
+    # hundreds of sidebar/session_state accesses and a local name skips the
+    # repeated attribute lookups
+    sb = st.sidebar
+    ss = st.session_state
+
     st.title("✂️ AI Background Removal")
     st.markdown("Remove backgrounds from your images using advanced AI models.")
-    
+
+    # Import rembg and probe model loading on first visit (lazy so users of
+    # the glitch page never pay the import/model cost)
+    with st.spinner("Loading background removal engine..."):
+        rembg_ready = _ensure_rembg()
+
     # Check rembg availability with detailed error information
-    if not REMBG_AVAILABLE:
+    if not rembg_ready:
         st.error("❌ **rembg library not available**")
         
         # Show specific error details if available
@@ -656,13 +1207,16 @@ def show_bg_removal_page():
         - Version conflicts with other packages
         """)
         return
-    
+
+    # Probe succeeded - grab the shared manager singleton
+    bg_manager = get_bg_manager()
+
     # Sidebar controls
-    st.sidebar.header("🎛️ Background Removal Settings")
+    sb.header("🎛️ Background Removal Settings")
     
     # Image input options
-    st.sidebar.subheader("📸 Image Input")
-    input_method = st.sidebar.radio(
+    sb.subheader("📸 Image Input")
+    input_method = sb.radio(
         "Choose input method:",
         ["Upload File", "URL"],
         help="Select how you want to provide the image"
@@ -673,14 +1227,14 @@ def show_bg_removal_page():
     
     if input_method == "Upload File":
         # File uploader
-        uploaded_file = st.sidebar.file_uploader(
+        uploaded_file = sb.file_uploader(
             "Upload Image",
             type=['png', 'jpg', 'jpeg', 'bmp', 'tiff'],
             help="Upload an image to remove its background"
         )
     else:
         # URL input
-        image_url = st.sidebar.text_input(
+        image_url = sb.text_input(
             "Image URL (must be jpg, png, etc.)",
             placeholder="https://example.com/image.jpg",
             help="Paste a direct link to an image (jpg, png, etc.)"
@@ -690,10 +1244,10 @@ def show_bg_removal_page():
             # Only validate if the user has actually typed something meaningful
             if len(image_url.strip()) > 0:
                 if not is_valid_url(image_url):
-                    st.sidebar.error("❌ Invalid URL! Must start with http:// or https:// and end with an image extension like jpg, png, webp.")
+                    sb.error("❌ Invalid URL! Must start with http:// or https:// and end with an image extension like jpg, png, webp.")
                     image_url = None
                 else:
-                    st.sidebar.success("✅ Valid image URL detected")
+                    sb.success("✅ Valid image URL detected")
             else:
                 # Reset to None if it's just whitespace
                 image_url = None
@@ -708,70 +1262,67 @@ def show_bg_removal_page():
                 "Filename": uploaded_file.name,
                 "File size": f"{uploaded_file.size / 1024:.1f} KB"
             }
-            st.sidebar.write("**File Details:**")
+            sb.write("**File Details:**")
             for key, value in file_details.items():
-                st.sidebar.write(f"- {key}: {value}")
+                sb.write(f"- {key}: {value}")
         elif image_url is not None:
             parsed_url = urlparse(image_url)
             filename = parsed_url.path.split('/')[-1] or "image"
-            st.sidebar.write("**URL Details:**")
-            st.sidebar.write(f"- Filename: {filename}")
-            st.sidebar.write(f"- Source: {parsed_url.netloc}")
+            sb.write("**URL Details:**")
+            sb.write(f"- Filename: {filename}")
+            sb.write(f"- Source: {parsed_url.netloc}")
         
-        st.sidebar.markdown("---")
+        sb.markdown("---")
         
         # Model selection
-        st.sidebar.subheader("🤖 AI Model Selection")
-        model_options = list(BackgroundRemovalManager.MODELS.keys())
-        model_labels = [f"{BackgroundRemovalManager.MODELS[m]['name']}" for m in model_options]
-        
-        selected_model_idx = st.sidebar.selectbox(
+        sb.subheader("🤖 AI Model Selection")
+        selected_model_idx = sb.selectbox(
             "Choose AI Model",
-            range(len(model_options)),
-            format_func=lambda x: model_labels[x],
+            range(len(_MODEL_KEYS)),
+            format_func=_MODEL_LABELS.__getitem__,
             index=0,
             help="Select the AI model for background removal"
         )
-        selected_model = model_options[selected_model_idx]
+        selected_model = _MODEL_KEYS[selected_model_idx]
         
         # Show model info
         model_info = BackgroundRemovalManager.MODELS[selected_model]
-        st.sidebar.success(f"**{model_info['name']}**")
-        st.sidebar.caption(f"📝 {model_info['description']}")
-        st.sidebar.caption(f"💡 Best for: {model_info['suitable_for']}")
-        st.sidebar.caption(f"📦 Size: {model_info['size']}")
+        sb.success(f"**{model_info['name']}**")
+        sb.caption(f"📝 {model_info['description']}")
+        sb.caption(f"💡 Best for: {model_info['suitable_for']}")
+        sb.caption(f"📦 Size: {model_info['size']}")
         
         # Model loading status
-        if st.session_state.bg_manager and st.session_state.bg_manager.is_model_loaded(selected_model):
-            st.sidebar.success(f"✅ Model loaded and ready")
+        if bg_manager.is_model_loaded(selected_model):
+            sb.success(f"✅ Model loaded and ready")
         else:
-            st.sidebar.info(f"📥 Model will download on first use")
+            sb.info(f"📥 Model will download on first use")
         
-        st.sidebar.markdown("---")
+        sb.markdown("---")
         
         # Output format
-        st.sidebar.subheader("🎨 Output Settings")
-        output_format = st.sidebar.radio(
+        sb.subheader("🎨 Output Settings")
+        output_format = sb.radio(
             "Background Type",
             ["transparent", "white", "custom"],
-            format_func=lambda x: {
-                "transparent": "🔳 Transparent (RGBA)",
-                "white": "⬜ White Background",
-                "custom": "🎨 Custom Color"
-            }[x],
+            format_func=_OUTPUT_FORMAT_LABELS.__getitem__,
             help="Choose the background for the output image"
         )
         
         # Custom background color
         if output_format == "custom":
             # Use previously selected color if available
-            default_color = st.session_state.bg_color if hasattr(st.session_state, 'bg_color') else "#000000"
-            bg_color = st.sidebar.color_picker("Background Color", default_color)
-            
-            # Show a preview of the selected color
-            st.sidebar.markdown(f"""
+            default_color = ss.bg_color if 'bg_color' in ss else "#000000"
+            bg_color = sb.color_picker("Background Color", default_color)
+
+            # Show a preview of the selected color; pick the label color from
+            # perceptual luminance (Rec. 601 weights) so e.g. saturated blue
+            # gets white text even though its channel sum is high
+            r, g, b = _hex_to_rgb(bg_color)
+            label_color = 'white' if 0.299 * r + 0.587 * g + 0.114 * b < 150 else 'black'
+            sb.markdown(f"""
             <div style="background-color: {bg_color}; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                <p style="color: {'white' if sum(int(bg_color[i:i+2], 16) for i in (1, 3, 5)) < 382 else 'black'}; text-align: center; margin: 0;">
+                <p style="color: {label_color}; text-align: center; margin: 0;">
                     Selected Background Color
                 </p>
             </div>
@@ -780,17 +1331,17 @@ def show_bg_removal_page():
             bg_color = None
         
         # Preview quality
-        preview_mode = st.sidebar.selectbox(
+        preview_mode = sb.selectbox(
             "Preview Quality",
             ["Fast", "Balanced", "High Quality"],
             index=1,
             help="Choose preview quality vs speed"
         )
         
-        st.sidebar.markdown("---")
+        sb.markdown("---")
         
         # Process button
-        process_bg = st.sidebar.button("🎯 Remove Background", type="primary")
+        process_bg = sb.button("🎯 Remove Background", type="primary")
         
         # Load and display original image - only if we have valid input
         try:
@@ -798,8 +1349,7 @@ def show_bg_removal_page():
                 original_image = load_image(uploaded_file)
             elif image_url is not None and len(image_url.strip()) > 0:
                 with st.spinner("Loading image from URL..."):
-                    pil_image = load_image_from_url(image_url)
-                    original_image = np.array(pil_image)
+                    original_image = load_image_from_url(image_url)
             else:
                 # This shouldn't happen due to has_image check, but just in case
                 st.error("❌ No valid image source provided")
@@ -819,109 +1369,125 @@ def show_bg_removal_page():
             st.subheader("✂️ Background Removed")
             
             if process_bg:
+                # Supersede any still-running job - the user asked for a new
+                # result, so the old one would be stale anyway
+                pending = ss.get('bg_pending_future')
+                if pending is not None and not pending.done():
+                    pending.cancel()
+
+                # Submit the heavy work to the background executor so this
+                # script run can finish and keep the widgets responsive
+                ss.bg_pending_future = _EXECUTOR.submit(
+                    bg_manager.remove_background,
+                    original_image,
+                    model_name=selected_model,
+                    return_rgba=(output_format == "transparent"),
+                    bg_color=bg_color if output_format == "custom" else None
+                )
+                ss.bg_pending_model = model_info['name']
+                ss.bg_pending_params = (output_format, bg_color)
+                ss.bg_pending_original = original_image
+
+            pending = ss.get('bg_pending_future')
+            if pending is not None:
+                if not pending.done():
+                    # Poll: show progress and schedule another rerun while the
+                    # worker thread finishes the inference
+                    st.info(f"⏳ Processing with {ss.bg_pending_model}...")
+                    time.sleep(0.2)
+                    st.rerun()
+
                 try:
-                    with st.spinner(f"Processing with {model_info['name']}..."):
-                        # Process the image
-                        processed_image = st.session_state.bg_manager.remove_background(
-                            original_image,
-                            model_name=selected_model,
-                            return_rgba=(output_format == "transparent"),
-                            bg_color=bg_color if output_format == "custom" else None
-                        )
-                        
-                        # Handle custom background
-                        if output_format == "custom" and processed_image.shape[2] == 4:
-                            # Convert hex color to RGB
-                            bg_rgb = tuple(int(bg_color[i:i+2], 16) for i in (1, 3, 5))
-                            
-                            # Store the background color for later use
-                            st.session_state.bg_color = bg_color
-                            st.session_state.bg_rgb = bg_rgb
-                            
-                            # Blend with custom background
-                            alpha = processed_image[:, :, 3:4] / 255.0
-                            rgb = processed_image[:, :, :3]
-                            custom_bg = np.ones_like(rgb) * np.array(bg_rgb)
-                            processed_image = (rgb * alpha + custom_bg * (1 - alpha)).astype(np.uint8)
-                        
-                        # Store in session state
-                        st.session_state.bg_processed_image = processed_image
-                        st.session_state.bg_original_image = original_image
-                        st.session_state.bg_output_format = output_format
-                        st.session_state.bg_model_used = model_info['name']
-                        
-                        # Display processed image
-                        st.image(processed_image, use_container_width=True)
-                        
-                        # Processing success message
-                        st.success(f"✅ Background removed successfully using {model_info['name']}")
-                        
+                    processed_image = pending.result()
+                    done_format, done_bg_color = ss.bg_pending_params
+
+                    # Handle custom background
+                    if done_format == "custom" and processed_image.shape[2] == 4:
+                        # Convert hex color to RGB
+                        bg_rgb = _hex_to_rgb(done_bg_color)
+
+                        # Store the background color for later use
+                        ss.bg_color = done_bg_color
+                        ss.bg_rgb = bg_rgb
+
+                        # Blend with custom background (integer blend, no
+                        # float temporaries)
+                        processed_image = _composite_background(processed_image, bg_rgb)
+
+                    # Store in session state; bumping the generation gives
+                    # downstream caches a key that can never collide the way
+                    # a recycled id() can
+                    ss.bg_generation = ss.get('bg_generation', 0) + 1
+                    ss.bg_processed_image = processed_image
+                    ss.bg_original_image = ss.bg_pending_original
+                    ss.bg_output_format = done_format
+                    ss.bg_model_used = ss.bg_pending_model
+
+                    # Display processed image
+                    st.image(processed_image, use_container_width=True)
+
+                    # Processing success message
+                    st.success(f"✅ Background removed successfully using {ss.bg_model_used}")
+
                 except ImportError:
                     st.error("❌ rembg library not available")
                 except Exception as e:
                     st.error(f"❌ Processing failed: {str(e)}")
                     if "model" in str(e).lower():
                         st.info("💡 Model downloading may take a few minutes on first use")
-            
-            elif hasattr(st.session_state, 'bg_processed_image'):
-                # Show previously processed image
-                display_image = st.session_state.bg_processed_image.copy()
-                
-                # Re-apply custom background if needed
-                if hasattr(st.session_state, 'bg_output_format') and st.session_state.bg_output_format == "custom":
-                    if hasattr(st.session_state, 'bg_rgb') and display_image.shape[2] == 4:
-                        # Re-apply the custom background color
-                        alpha = display_image[:, :, 3:4] / 255.0
-                        rgb = display_image[:, :, :3]
-                        custom_bg = np.ones_like(rgb) * np.array(st.session_state.bg_rgb)
-                        display_image = (rgb * alpha + custom_bg * (1 - alpha)).astype(np.uint8)
-                
-                st.image(display_image, use_container_width=True)
-                st.info(f"✅ Processed with {st.session_state.bg_model_used}")
+                finally:
+                    # Job consumed - clear the pending slot either way
+                    ss.bg_pending_future = None
+                    ss.bg_pending_original = None
+
+            elif 'bg_processed_image' in ss:
+                # Show previously processed image with the custom background
+                # re-applied (cached, so reruns skip the blend). The widget
+                # is fed encoded PNG bytes from the LRU preview cache, so
+                # redraws skip st.image's per-rerun array encode too
+                # The key is (generation, format, color) rather than the
+                # array's id() - addresses of dead arrays get recycled, and
+                # a stale hit here would render the wrong preview
+                display_image = _get_composited_bg_image()
+                cache_key = (ss.get('bg_generation', 0),
+                             ss.get('bg_output_format'),
+                             ss.get('bg_rgb'))
+                display_bytes = _preview_cache_get(ss.preview_cache, cache_key)
+                if display_bytes is None:
+                    display_bytes = _preview_cache_put(
+                        ss.preview_cache, cache_key, display_image)
+
+                st.image(display_bytes, use_container_width=True)
+                st.info(f"✅ Processed with {ss.bg_model_used}")
             
             else:
                 st.info("👆 Click 'Remove Background' to process the image")
         
         # Download section
-        if hasattr(st.session_state, 'bg_processed_image'):
+        if 'bg_processed_image' in ss:
             st.markdown("---")
             st.subheader("📥 Download Options")
             
             # Prepare the download image with proper background handling
-            download_image = st.session_state.bg_processed_image.copy()
-            
-            # Re-apply custom background if needed
-            if hasattr(st.session_state, 'bg_output_format') and st.session_state.bg_output_format == "custom":
-                if hasattr(st.session_state, 'bg_rgb') and download_image.shape[2] == 4:
-                    # Re-apply the custom background color
-                    alpha = download_image[:, :, 3:4] / 255.0
-                    rgb = download_image[:, :, :3]
-                    custom_bg = np.ones_like(rgb) * np.array(st.session_state.bg_rgb)
-                    download_image = (rgb * alpha + custom_bg * (1 - alpha)).astype(np.uint8)
-            
+            # (shares the cached composite with the display path); buffers
+            # are only re-encoded when the underlying image changes
+            download_image = _get_composited_bg_image()
+            is_transparent = ss.bg_output_format == "transparent"
+            png_bytes, jpg_bytes = _downloads_for(
+                download_image, 'bg_downloads', want_jpeg=not is_transparent)
+
             col_dl1, col_dl2, col_dl3 = st.columns(3)
-            
+
             with col_dl1:
-                if st.session_state.bg_output_format == "transparent":
-                    png_bytes = image_to_bytes(download_image, 'PNG')
-                    st.download_button(
-                        "📥 Download PNG (Transparent)",
-                        data=png_bytes,
-                        file_name="background_removed.png",
-                        mime="image/png"
-                    )
-                else:
-                    png_bytes = image_to_bytes(download_image, 'PNG')
-                    st.download_button(
-                        "📥 Download PNG",
-                        data=png_bytes,
-                        file_name="background_removed.png",
-                        mime="image/png"
-                    )
-            
+                st.download_button(
+                    "📥 Download PNG (Transparent)" if is_transparent else "📥 Download PNG",
+                    data=png_bytes,
+                    file_name="background_removed.png",
+                    mime="image/png"
+                )
+
             with col_dl2:
-                if st.session_state.bg_output_format != "transparent":
-                    jpg_bytes = image_to_bytes(download_image, 'JPEG')
+                if not is_transparent:
                     st.download_button(
                         "📥 Download JPEG",
                         data=jpg_bytes,
@@ -930,10 +1496,11 @@ def show_bg_removal_page():
                     )
                 else:
                     st.caption("JPEG not available for transparent images")
-            
+
             with col_dl3:
                 # Original image download
-                orig_bytes = image_to_bytes(st.session_state.bg_original_image, 'PNG')
+                orig_bytes, _ = _downloads_for(
+                    ss.bg_original_image, 'bg_orig_download', want_jpeg=False)
                 st.download_button(
                     "📥 Download Original",
                     data=orig_bytes,
@@ -975,21 +1542,29 @@ def show_imageglitch_page():
     The function implements a responsive UI with real-time feedback as users
     adjust effect parameters, using caching for performance optimization.
     """
+    # Bind the hot Streamlit handles once per rerun - these functions make
+    # hundreds of sidebar/session_state accesses and a local name skips the
+    # repeated attribute lookups
+    sb = st.sidebar
+    ss = st.session_state
+
     st.title("🎨 ImageGlitch: Real-Time Image Manipulation")
     st.markdown("Apply various glitch effects and see results in real-time.")
     
-    # Initialize preview cache for this page
-    if 'glitch_preview_cache' not in st.session_state:
-        st.session_state.glitch_preview_cache = {}
-    if 'glitch_last_hash' not in st.session_state:
-        st.session_state.glitch_last_hash = None
+    # Initialize preview cache for this page - LRU-bounded, since every
+    # distinct slider combination would otherwise retain a preview-sized
+    # array forever
+    if 'glitch_preview_cache' not in ss:
+        ss.glitch_preview_cache = OrderedDict()
+    if 'glitch_last_hash' not in ss:
+        ss.glitch_last_hash = None
     
     # Sidebar controls
-    st.sidebar.header("🎛️ ImageGlitch Controls")
+    sb.header("🎛️ ImageGlitch Controls")
     
     # Image input options
-    st.sidebar.subheader("📸 Image Input")
-    input_method = st.sidebar.radio(
+    sb.subheader("📸 Image Input")
+    input_method = sb.radio(
         "Choose input method:",
         ["Upload File", "URL"],
         help="Select how you want to provide the image"
@@ -1000,14 +1575,14 @@ def show_imageglitch_page():
     
     if input_method == "Upload File":
         # File uploader
-        uploaded_file = st.sidebar.file_uploader(
+        uploaded_file = sb.file_uploader(
             "Upload Image",
             type=['png', 'jpg', 'jpeg', 'bmp', 'tiff'],
             help="Upload an image to apply glitch effects"
         )
     else:
         # URL input
-        image_url = st.sidebar.text_input(
+        image_url = sb.text_input(
             "Image URL",
             placeholder="https://example.com/image.jpg",
             help="Paste a direct link to an image (jpg, png, etc.)"
@@ -1017,10 +1592,10 @@ def show_imageglitch_page():
             # Only validate if the user has actually typed something meaningful
             if len(image_url.strip()) > 0:
                 if not is_valid_url(image_url):
-                    st.sidebar.error("❌ Please enter a valid image URL with proper extension (.jpg, .png, .bmp, .tiff)")
+                    sb.error("❌ Please enter a valid image URL with proper extension (.jpg, .png, .bmp, .tiff)")
                     image_url = None
                 else:
-                    st.sidebar.success("✅ Valid image URL detected")
+                    sb.success("✅ Valid image URL detected")
             else:
                 # Reset to None if it's just whitespace
                 image_url = None
@@ -1035,23 +1610,23 @@ def show_imageglitch_page():
                 "Filename": uploaded_file.name,
                 "File size": f"{uploaded_file.size / 1024:.1f} KB"
             }
-            st.sidebar.write("**File Details:**")
+            sb.write("**File Details:**")
             for key, value in file_details.items():
-                st.sidebar.write(f"- {key}: {value}")
+                sb.write(f"- {key}: {value}")
         elif image_url is not None:
             parsed_url = urlparse(image_url)
             filename = parsed_url.path.split('/')[-1] or "image"
-            st.sidebar.write("**URL Details:**")
-            st.sidebar.write(f"- Filename: {filename}")
-            st.sidebar.write(f"- Source: {parsed_url.netloc}")
+            sb.write("**URL Details:**")
+            sb.write(f"- Filename: {filename}")
+            sb.write(f"- Source: {parsed_url.netloc}")
         
-        st.sidebar.markdown("---")
+        sb.markdown("---")
         
         # Preview settings
-        st.sidebar.subheader("⚡ Real-Time Preview")
-        auto_preview = st.sidebar.checkbox("Auto Preview", value=True, help="Show effects in real-time")
+        sb.subheader("⚡ Real-Time Preview")
+        auto_preview = sb.checkbox("Auto Preview", value=True, help="Show effects in real-time")
         
-        preview_mode = st.sidebar.selectbox(
+        preview_mode = sb.selectbox(
             "Preview Quality",
             ["Fast", "Balanced", "High Quality"],
             index=1,
@@ -1059,21 +1634,21 @@ def show_imageglitch_page():
         )
         
         if not auto_preview:
-            manual_refresh = st.sidebar.button("🔄 Refresh Preview")
+            manual_refresh = sb.button("🔄 Refresh Preview")
         else:
             manual_refresh = False
         
-        st.sidebar.markdown("---")
+        sb.markdown("---")
         
         # Extreme mode
-        st.sidebar.subheader("⚡ Effect Mode")
-        extreme_mode = st.sidebar.toggle("Extreme Mode", value=False, 
+        sb.subheader("⚡ Effect Mode")
+        extreme_mode = sb.toggle("Extreme Mode", value=False, 
                                         help="Enable extreme parameter ranges")
         
         if extreme_mode:
-            st.sidebar.warning("🚨 **EXTREME MODE** - High intensity effects!")
+            sb.warning("🚨 **EXTREME MODE** - High intensity effects!")
         
-        st.sidebar.markdown("---")
+        sb.markdown("---")
         
         # Define original_image early for safe reference
         original_image = None
@@ -1085,11 +1660,10 @@ def show_imageglitch_page():
                 # Auto-correct URL scheme if missing
                 if not image_url.lower().startswith(('http://', 'https://')):
                     image_url = "https://" + image_url
-                    st.sidebar.info("ℹ️ Corrected URL to include 'https://' at the beginning")
+                    sb.info("ℹ️ Corrected URL to include 'https://' at the beginning")
                 
                 with st.spinner("Loading image from URL..."):
-                    pil_image = load_image_from_url(image_url)
-                    original_image = np.array(pil_image)
+                    original_image = load_image_from_url(image_url)
         except ValueError as ve:
             st.error(f"❌ Failed to load image: {str(ve)}")
             return
@@ -1100,71 +1674,89 @@ def show_imageglitch_page():
         if original_image is None:
             # Exit early if no valid image was loaded
             return
-        
+
+        # Content identity of the loaded image for cache keys - recomputed
+        # only when the source (upload or URL) changes, not on every rerun
+        source_key = (getattr(uploaded_file, 'file_id', None) or uploaded_file.name
+                      if uploaded_file is not None else image_url)
+        if ss.get('glitch_image_source') != source_key:
+            ss.glitch_image_hash = _array_content_hash(original_image)
+            ss.glitch_image_source = source_key
+        image_hash = ss.glitch_image_hash
+
         # Effects controls
-        st.sidebar.subheader("🔊 Noise Effects")
-        gaussian_enabled = st.sidebar.checkbox("Gaussian Noise")
+        sb.subheader("🔊 Noise Effects")
+        gaussian_enabled = sb.checkbox("Gaussian Noise")
         if extreme_mode:
-            gaussian_variance = st.sidebar.slider("Variance (EXTREME)", 0.0, 5.0, 0.02, key='g_var')
+            gaussian_variance = sb.slider("Variance (EXTREME)", 0.0, 5.0, 0.02, key='g_var')
         else:
-            gaussian_variance = st.sidebar.slider("Variance", 0.0, 0.1, 0.02, key='g_var')
+            gaussian_variance = sb.slider("Variance", 0.0, 0.1, 0.02, key='g_var')
         
-        salt_pepper_enabled = st.sidebar.checkbox("Salt & Pepper Noise")
+        salt_pepper_enabled = sb.checkbox("Salt & Pepper Noise")
         if extreme_mode:
-            salt_pepper_amount = st.sidebar.slider("Amount (EXTREME)", 0.0, 1.0, 0.01, key='sp_amt')
+            salt_pepper_amount = sb.slider("Amount (EXTREME)", 0.0, 1.0, 0.01, key='sp_amt')
         else:
-            salt_pepper_amount = st.sidebar.slider("Amount", 0.0, 0.1, 0.01, key='sp_amt')
+            salt_pepper_amount = sb.slider("Amount", 0.0, 0.1, 0.01, key='sp_amt')
         
-        st.sidebar.subheader("🌫️ Blur Effects")
-        gaussian_blur_enabled = st.sidebar.checkbox("Gaussian Blur")
+        sb.subheader("🌫️ Blur Effects")
+        gaussian_blur_enabled = sb.checkbox("Gaussian Blur")
         if extreme_mode:
-            gaussian_kernel = st.sidebar.slider("Kernel Size (EXTREME)", 3, 101, 7, step=2, key='gb_kern')
+            gaussian_kernel = sb.slider("Kernel Size (EXTREME)", 3, 101, 7, step=2, key='gb_kern')
         else:
-            gaussian_kernel = st.sidebar.slider("Kernel Size", 3, 15, 7, step=2, key='gb_kern')
+            gaussian_kernel = sb.slider("Kernel Size", 3, 15, 7, step=2, key='gb_kern')
         
-        motion_blur_enabled = st.sidebar.checkbox("Motion Blur")
+        motion_blur_enabled = sb.checkbox("Motion Blur")
         if extreme_mode:
-            motion_degree = st.sidebar.slider("Degree (EXTREME)", 1, 100, 20, key='mb_deg')
+            motion_degree = sb.slider("Degree (EXTREME)", 1, 100, 20, key='mb_deg')
         else:
-            motion_degree = st.sidebar.slider("Degree", 1, 30, 20, key='mb_deg')
-        motion_angle = st.sidebar.slider("Angle", 0, 360, 45, key='mb_ang')
+            motion_degree = sb.slider("Degree", 1, 30, 20, key='mb_deg')
+        motion_angle = sb.slider("Angle", 0, 360, 45, key='mb_ang')
         
-        box_blur_enabled = st.sidebar.checkbox("Box Blur")
+        box_blur_enabled = sb.checkbox("Box Blur")
         if extreme_mode:
-            box_kernel = st.sidebar.slider("Box Kernel (EXTREME)", 3, 101, 5, step=2, key='bb_kern')
+            box_kernel = sb.slider("Box Kernel (EXTREME)", 3, 101, 5, step=2, key='bb_kern')
         else:
-            box_kernel = st.sidebar.slider("Box Kernel", 3, 15, 5, step=2, key='bb_kern')
+            box_kernel = sb.slider("Box Kernel", 3, 15, 5, step=2, key='bb_kern')
         
-        st.sidebar.subheader("📳 Shake Effects")
-        camera_shake_enabled = st.sidebar.checkbox("Camera Shake")
+        sb.subheader("📳 Shake Effects")
+        camera_shake_enabled = sb.checkbox("Camera Shake")
         if extreme_mode:
-            camera_intensity = st.sidebar.slider("Intensity (EXTREME)", 1, 50, 5, key='cs_int')
+            camera_intensity = sb.slider("Intensity (EXTREME)", 1, 50, 5, key='cs_int')
         else:
-            camera_intensity = st.sidebar.slider("Intensity", 1, 10, 5, key='cs_int')
+            camera_intensity = sb.slider("Intensity", 1, 10, 5, key='cs_int')
         
-        directional_shake_enabled = st.sidebar.checkbox("Directional Shake")
+        directional_shake_enabled = sb.checkbox("Directional Shake")
         if extreme_mode:
-            dir_intensity = st.sidebar.slider("Direction Intensity (EXTREME)", 1, 50, 8, key='ds_int')
+            dir_intensity = sb.slider("Direction Intensity (EXTREME)", 1, 50, 8, key='ds_int')
         else:
-            dir_intensity = st.sidebar.slider("Direction Intensity", 1, 10, 8, key='ds_int')
-        shake_direction = st.sidebar.selectbox("Direction", ["horizontal", "vertical", "both"], key='ds_dir')
+            dir_intensity = sb.slider("Direction Intensity", 1, 10, 8, key='ds_int')
+        shake_direction = sb.selectbox("Direction", ["horizontal", "vertical", "both"], key='ds_dir')
         
-        st.sidebar.subheader("🏃 Motion Effects")
-        motion_distortion_enabled = st.sidebar.checkbox("Motion Distortion")
-        motion_direction = st.sidebar.selectbox("Motion Direction", ["horizontal", "vertical", "diagonal"], key='md_dir')
+        sb.subheader("🏃 Motion Effects")
+        motion_distortion_enabled = sb.checkbox("Motion Distortion")
+        motion_direction = sb.selectbox("Motion Direction", ["horizontal", "vertical", "diagonal"], key='md_dir')
         if extreme_mode:
-            motion_intensity = st.sidebar.slider("Motion Intensity (EXTREME)", 1, 100, 15, key='md_int')
+            motion_intensity = sb.slider("Motion Intensity (EXTREME)", 1, 100, 15, key='md_int')
         else:
-            motion_intensity = st.sidebar.slider("Motion Intensity", 1, 20, 15, key='md_int')
+            motion_intensity = sb.slider("Motion Intensity", 1, 20, 15, key='md_int')
         
-        zoom_motion_enabled = st.sidebar.checkbox("Zoom Motion Blur")
+        zoom_motion_enabled = sb.checkbox("Zoom Motion Blur")
         if extreme_mode:
-            zoom_intensity = st.sidebar.slider("Zoom Intensity (EXTREME)", 1, 50, 5, key='zm_int')
+            zoom_intensity = sb.slider("Zoom Intensity (EXTREME)", 1, 50, 5, key='zm_int')
         else:
-            zoom_intensity = st.sidebar.slider("Zoom Intensity", 1, 10, 5, key='zm_int')
-        
-        st.sidebar.markdown("---")
+            zoom_intensity = sb.slider("Zoom Intensity", 1, 10, 5, key='zm_int')
         
+        sb.markdown("---")
+
+        # Quantize the continuous sliders to a coarse grid before anything
+        # hashes them: consecutive drag positions then collapse onto the
+        # same parameters, turning near-identical recomputes into preview
+        # and stage cache hits. The integer sliders are already discrete;
+        # these steps sit below the visible-difference threshold
+        gaussian_variance = _quantize(gaussian_variance, 0.005)
+        salt_pepper_amount = _quantize(salt_pepper_amount, 0.005)
+        motion_angle = int(_quantize(motion_angle, 5))
+
         # Collect effects
         effects = {
             'gaussian_noise': {'enabled': gaussian_enabled, 'variance': gaussian_variance},
@@ -1182,70 +1774,93 @@ def show_imageglitch_page():
         any_effect_enabled = any(effect_params.get('enabled', False) for effect_params in effects.values())
         
         # Action button
-        process_full = st.sidebar.button("🎯 Process Full Quality", type="primary", disabled=not any_effect_enabled)
-        
-        # Real-time preview logic
-        current_hash = hash_effects(effects)
-        should_update = (
-            (auto_preview or manual_refresh) and
-            any_effect_enabled and
-            (current_hash != st.session_state.glitch_last_hash or manual_refresh)
-        )
-        
+        process_full = sb.button("🎯 Process Full Quality", type="primary", disabled=not any_effect_enabled)
+        
+        # Real-time preview logic - gate on a canonical tuple of the widget
+        # values; CPython hashes the tuple in C, which is far cheaper than
+        # serializing the nested effects dict on every slider tick. With no
+        # effects enabled (the default page state) there is nothing to
+        # preview, so skip the hash entirely
+        if any_effect_enabled:
+            effects_hash = hash((
+                gaussian_enabled, gaussian_variance,
+                salt_pepper_enabled, salt_pepper_amount,
+                gaussian_blur_enabled, gaussian_kernel,
+                motion_blur_enabled, motion_degree, motion_angle,
+                box_blur_enabled, box_kernel,
+                camera_shake_enabled, camera_intensity,
+                directional_shake_enabled, dir_intensity, shake_direction,
+                motion_distortion_enabled, motion_direction, motion_intensity,
+                zoom_motion_enabled, zoom_intensity,
+            ))
+            # Key previews on image identity and preview quality too, so
+            # swapping the source image or quality mode can never serve a
+            # stale preview
+            current_hash = (effects_hash, image_hash, preview_mode)
+            should_update = (
+                (auto_preview or manual_refresh) and
+                (current_hash != ss.glitch_last_hash or manual_refresh)
+            )
+        else:
+            current_hash = None
+            should_update = False
+        
+        # Debounce slider drags: if this change landed hot on the heels of
+        # the previous preview run, defer it one short rerun instead of
+        # recomputing 10-30 times per second. Manual refreshes always run.
+        if should_update and not manual_refresh:
+            since_last = time.monotonic() - ss.get('glitch_last_run', 0.0)
+            if since_last < GLITCH_PREVIEW_DEBOUNCE_S:
+                time.sleep(GLITCH_PREVIEW_DEBOUNCE_S - since_last)
+                st.rerun()
+
         if should_update:
             try:
                 preview_start = time.time()
                 
-                # Ensure original image is in the right format before preview processing
-                if original_image.dtype != np.uint8:
-                    preview_orig = np.clip(original_image, 0, 255).astype(np.uint8)
-                else:
-                    preview_orig = original_image
-                
-                # Resize for preview
-                preview_image = PreviewManager.resize_for_preview(preview_orig, preview_mode)
-                
+                # Resize for preview - memoized per (image, quality mode) so
+                # effect-only changes skip the resize entirely. The decoder
+                # guarantees uint8 input and the pipeline preserves it, so no
+                # dtype guards are needed anywhere on this path
+                preview_image = _resized_preview(original_image, image_hash, preview_mode)
+
                 # Apply effects
                 processed_preview = apply_imageglitch_effects(preview_image, effects)
-                
-                # Ensure preview is in the right format for display
-                if processed_preview.dtype != np.uint8:
-                    processed_preview = np.clip(processed_preview, 0, 255).astype(np.uint8)
-                
-                # Store in cache
-                st.session_state.glitch_preview_cache[current_hash] = processed_preview.copy()
-                st.session_state.glitch_last_hash = current_hash
-                st.session_state.glitch_preview_time = time.time() - preview_start
+
+                # Store in cache (no defensive copy - the preview isn't
+                # mutated after this point) and evict beyond the LRU cap
+                cache = ss.glitch_preview_cache
+                cache[current_hash] = processed_preview
+                cache.move_to_end(current_hash)
+                while len(cache) > GLITCH_PREVIEW_CACHE_MAX_ENTRIES:
+                    cache.popitem(last=False)
+                ss.glitch_last_hash = current_hash
+                ss.glitch_last_run = time.monotonic()
+                ss.glitch_preview_time = time.time() - preview_start
                 
             except Exception as e:
-                st.sidebar.error(f"Preview failed: {str(e)}")
+                sb.error(f"Preview failed: {str(e)}")
                 processed_preview = None
         else:
-            processed_preview = st.session_state.glitch_preview_cache.get(current_hash)
-            
-            # Ensure cached preview is in the right format
-            if processed_preview is not None and processed_preview.dtype != np.uint8:
-                processed_preview = np.clip(processed_preview, 0, 255).astype(np.uint8)
-        
+            cache = ss.glitch_preview_cache
+            processed_preview = cache.get(current_hash)
+            if processed_preview is not None:
+                # Refresh LRU position on hit
+                cache.move_to_end(current_hash)
+
         # Process full quality
         if process_full and any_effect_enabled:
             with st.spinner("Processing full quality image..."):
                 try:
-                    # Ensure original image is in the right format before processing
-                    if original_image.dtype != np.uint8:
-                        original_image = np.clip(original_image, 0, 255).astype(np.uint8)
-                    
-                    # Apply effects to full quality image
+                    # Apply effects to full quality image - uint8 in, uint8 out
                     full_processed = apply_imageglitch_effects(original_image, effects)
-                    
-                    # Ensure processed image is in the right format for storage
-                    if full_processed.dtype != np.uint8:
-                        full_processed = np.clip(full_processed, 0, 255).astype(np.uint8)
-                    
-                    # Store processed and original images in session state
-                    st.session_state.glitch_processed_image = full_processed.copy()
-                    st.session_state.glitch_original_image = original_image.copy()
-                    st.session_state.glitch_effects_applied = [name.replace('_', ' ').title() 
+
+                    # Store processed and original images in session state -
+                    # both are already private arrays (fresh effect output and
+                    # the cached decoder's per-call copy), so no .copy() needed
+                    ss.glitch_processed_image = full_processed
+                    ss.glitch_original_image = original_image
+                    ss.glitch_effects_applied = [name.replace('_', ' ').title() 
                                                              for name, params in effects.items() 
                                                              if params.get('enabled', False)]
                 except Exception as e:
@@ -1256,26 +1871,31 @@ def show_imageglitch_page():
         
         with col1:
             st.subheader("📷 Original Image")
-            st.image(original_image, use_container_width=True)
-        
+            # Display-only downscale: the widget renders at most a few
+            # hundred pixels wide, so shipping the full-resolution array to
+            # the browser on every rerun is wasted encode and transfer. The
+            # download section still serves the original at full quality
+            st.image(_resized_preview(original_image, image_hash, preview_mode),
+                     use_container_width=True)
+
         with col2:
             if any_effect_enabled and processed_preview is not None:
                 st.subheader("🔴 Real-Time Preview")
                 st.image(processed_preview, use_container_width=True)
                 
                 # Show preview stats
-                if hasattr(st.session_state, 'glitch_preview_time'):
-                    preview_ms = st.session_state.glitch_preview_time * 1000
+                if 'glitch_preview_time' in ss:
+                    preview_ms = ss.glitch_preview_time * 1000
                     st.caption(f"Preview: {preview_mode} | Time: {preview_ms:.1f}ms")
                 
                 # Show active effects
                 active_effects = [name.replace('_', ' ').title() for name, params in effects.items() if params.get('enabled', False)]
                 st.info(f"🔴 **Active effects:** {', '.join(active_effects)}")
                 
-            elif hasattr(st.session_state, 'glitch_processed_image'):
+            elif 'glitch_processed_image' in ss:
                 st.subheader("✅ Processed Image")
-                st.image(st.session_state.glitch_processed_image, use_container_width=True)
-                st.success(f"✅ **Applied:** {', '.join(st.session_state.glitch_effects_applied)}")
+                st.image(ss.glitch_processed_image, use_container_width=True)
+                st.success(f"✅ **Applied:** {', '.join(ss.glitch_effects_applied)}")
             
             else:
                 st.subheader("🎨 Glitch Effects Preview")
@@ -1288,24 +1908,19 @@ def show_imageglitch_page():
                     st.info("👆 Select effects to see preview")
         
         # Download section for ImageGlitch
-        if hasattr(st.session_state, 'glitch_processed_image'):
+        if 'glitch_processed_image' in ss:
             st.markdown("---")
             st.subheader("📥 Download Processed Image")
             
             col_dl1, col_dl2, col_dl3 = st.columns(3)
             
-            # Ensure processed image is in the correct format before download
-            processed_image = st.session_state.glitch_processed_image
-            if processed_image.dtype != np.uint8:
-                processed_image = np.clip(processed_image, 0, 255).astype(np.uint8)
-            
-            # Ensure original image is in the correct format before download
-            original_image = st.session_state.glitch_original_image
-            if original_image.dtype != np.uint8:
-                original_image = np.clip(original_image, 0, 255).astype(np.uint8)
-            
+            processed_image = ss.glitch_processed_image
+            original_image = ss.glitch_original_image
+
+            # Buffers are only re-encoded when the processed image changes
+            png_bytes, jpg_bytes = _downloads_for(processed_image, 'glitch_downloads')
+
             with col_dl1:
-                png_bytes = image_to_bytes(processed_image, 'PNG')
                 st.download_button(
                     "📥 Download PNG",
                     data=png_bytes,
@@ -1313,9 +1928,8 @@ def show_imageglitch_page():
                     mime="image/png",
                     help="Download the processed image with all applied effects as PNG"
                 )
-            
+
             with col_dl2:
-                jpg_bytes = image_to_bytes(processed_image, 'JPEG')
                 st.download_button(
                     "📥 Download JPEG",
                     data=jpg_bytes,
@@ -1325,7 +1939,7 @@ def show_imageglitch_page():
                 )
             
             with col_dl3:
-                orig_bytes = image_to_bytes(original_image, 'PNG')
+                orig_bytes, _ = _downloads_for(original_image, 'glitch_orig_download', want_jpeg=False)
                 st.download_button(
                     "📥 Download Original",
                     data=orig_bytes,
@@ -1558,9 +2172,12 @@ def show_home_page():
     col_status1, col_status2, col_status3 = st.columns(3)
     
     with col_status1:
-        if REMBG_AVAILABLE:
+        if st.session_state.get('rembg_available'):
             st.success("✅ **rembg Available**")
             st.caption("AI background removal ready")
+        elif st.session_state.get('rembg_available') is None:
+            st.info("💤 **rembg Not Loaded**")
+            st.caption("Loads when you open Background Removal")
         else:
             st.error("❌ **rembg Not Installed**")
             st.caption("Background removal unavailable")
@@ -1634,18 +2251,21 @@ def main():
     st.sidebar.markdown("---")
     st.sidebar.subheader("📊 System Status")
     
-    if REMBG_AVAILABLE:
+    if st.session_state.get('rembg_available'):
         st.sidebar.success("✅ rembg Available")
+    elif st.session_state.get('rembg_available') is None:
+        st.sidebar.info("💤 rembg loads on first use")
     else:
         st.sidebar.error("❌ rembg Missing")
         st.sidebar.caption("Install: `pip install rembg`")
-    
+
     st.sidebar.success("✅ ImageGlitch Ready")
-    
+
     # Model status
-    if REMBG_AVAILABLE and st.session_state.bg_manager:
-        loaded_models = sum(1 for model in BackgroundRemovalManager.MODELS.keys() 
-                          if st.session_state.bg_manager.is_model_loaded(model))
+    if st.session_state.get('rembg_available'):
+        bg_manager = get_bg_manager()
+        loaded_models = sum(1 for model in BackgroundRemovalManager.MODELS.keys()
+                          if bg_manager.is_model_loaded(model))
         st.sidebar.info(f"📊 {loaded_models}/5 AI Models Loaded")
     
     st.sidebar.markdown("---")
@@ -9,7 +9,8 @@
 # - motion: Creating motion distortion and zoom effects
 #
 # All functions accept numpy arrays as input and return processed images
-# as float32 arrays to allow for further processing in the pipeline.
+# in the same dtype as the input, so a uint8 pipeline stays uint8 end to
+# end without intermediate promotion copies.
 #
 # These utilities are designed to work with the ImageGlitch application
 # but can also be used independently for creative image manipulation.
\ No newline at end of file
@@ -0,0 +1,44 @@
+# Thread-local scratch buffers shared by the effect modules.
+#
+# The live preview re-runs effects on every slider tick, and several of
+# them need a full-frame temporary (a noise buffer, a warp target). A
+# fresh np.empty per call is pure allocator churn; scratch() hands back a
+# reusable buffer keyed on (shape, dtype) instead.
+#
+# The pool is thread-local so concurrent Streamlit sessions never alias
+# each other's temporaries. Scratch buffers are strictly for
+# intermediates that do not escape their function - anything returned to
+# a caller must remain freshly allocated, since results are retained in
+# session state and caches.
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+_local = threading.local()
+
+# Cap on distinct (shape, dtype) buffers kept per thread; least recently
+# used shapes are dropped so switching between many image sizes cannot
+# pin an unbounded set of full-frame buffers
+_MAX_BUFFERS = 8
+
+def scratch(shape, dtype):
+    """Return a reusable thread-local buffer of the given shape and dtype.
+
+    The contents are undefined on entry; callers must fully overwrite the
+    buffer before reading it. The per-thread pool is LRU-bounded at
+    _MAX_BUFFERS shapes.
+    """
+    buffers = getattr(_local, 'buffers', None)
+    if buffers is None:
+        buffers = _local.buffers = OrderedDict()
+    key = (shape, np.dtype(dtype).str)
+    buf = buffers.get(key)
+    if buf is None:
+        buf = buffers[key] = np.empty(shape, dtype)
+        while len(buffers) > _MAX_BUFFERS:
+            buffers.popitem(last=False)
+    else:
+        buffers.move_to_end(key)
+    return buf
@@ -0,0 +1,33 @@
+# OpenCL offload helpers for the effect modules.
+#
+# OpenCV's transparent API runs filter2D, sepFilter2D, boxFilter, and
+# warpAffine on the GPU when handed a cv2.UMat instead of an ndarray. The
+# effect functions wrap their input with maybe_umat() and unwrap the
+# result with to_ndarray(); on machines without OpenCL both are
+# passthroughs. The pipeline caches stage outputs as plain arrays keyed on
+# their bytes, so UMats never cross function boundaries - each stage pays
+# one upload/download, which the size threshold keeps worthwhile.
+
+import cv2
+
+try:
+    OPENCL_AVAILABLE = bool(cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL())
+except cv2.error:
+    OPENCL_AVAILABLE = False
+
+# Below this many array elements the host<->device copies cost more than
+# the kernel saves - small previews stay on the CPU
+_MIN_OFFLOAD_SIZE = 1_000_000
+
+def maybe_umat(image):
+    """Return a UMat view of image when OpenCL offload is worthwhile,
+    otherwise the array unchanged."""
+    if OPENCL_AVAILABLE and image.size > _MIN_OFFLOAD_SIZE:
+        return cv2.UMat(image)
+    return image
+
+def to_ndarray(result):
+    """Download a UMat result back to an ndarray; passthrough for arrays."""
+    if isinstance(result, cv2.UMat):
+        return result.get()
+    return result
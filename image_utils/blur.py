@@ -1,6 +1,19 @@
+from functools import lru_cache
+
 import numpy as np
 import cv2
 
+from ._opencl import maybe_umat, to_ndarray
+
+@lru_cache(maxsize=32)
+def _gaussian_kernel_1d(kernel_size):
+    """Return the cached 1D Gaussian kernel for a given (odd) size.
+
+    The coefficients depend only on the size, and the live preview calls
+    the blur with the same handful of slider values over and over.
+    """
+    return cv2.getGaussianKernel(kernel_size, 0, ktype=cv2.CV_32F)
+
 def apply_gaussian_blur(image, kernel_size=5):
     """
     Apply Gaussian blur to an image for smooth, natural-looking blur effects.
@@ -17,24 +30,55 @@ def apply_gaussian_blur(image, kernel_size=5):
                     Typical values: 3 (subtle), 5 (moderate), 9 (strong), 15 (very strong)
         
     Returns:
-        Blurred image as float32 array
-        (Not converted to uint8 to allow for further processing)
-    
+        Blurred image, same dtype as the input
+
     Note:
         If an even kernel size is provided, it will be incremented by 1 to ensure oddness
         The function preserves the original image dimensions and channels
     """
-    # Ensure we're working with float32 for processing
-    image_float = image.copy().astype(np.float32)
-    
     # Ensure kernel size is odd
     if kernel_size % 2 == 0:
         kernel_size += 1
-    
-    # Apply Gaussian blur
-    blurred = cv2.GaussianBlur(image_float, (kernel_size, kernel_size), 0)
-    
-    return blurred
+
+    # Apply the blur as two cached 1D passes - cv2 operates on uint8
+    # directly and preserves dtype, and sepFilter2D skips the per-call
+    # kernel computation GaussianBlur repeats for large kernels. Large
+    # frames go through the OpenCL backend when one is available
+    k = _gaussian_kernel_1d(kernel_size)
+    blurred = cv2.sepFilter2D(maybe_umat(image), -1, k, k)
+
+    return to_ndarray(blurred)
+
+@lru_cache(maxsize=256)
+def _motion_kernel(degree, angle):
+    """Build and cache the normalized motion-blur kernel for (degree, angle).
+
+    The kernel depends only on these two small discrete slider values, so
+    the rasterization cost is paid once per combination instead of on
+    every preview rerun.
+    """
+    kernel_size = degree
+    if kernel_size % 2 == 0:
+        kernel_size += 1  # Ensure odd size
+
+    kernel = np.zeros((kernel_size, kernel_size))
+
+    # Calculate center point
+    center = kernel_size // 2
+
+    # Rasterize the line directly: sample one point per kernel row/column
+    # along the segment and round to cell centers. Equivalent coverage to
+    # the old cv2.line call without the OpenCV round trip, and duplicate
+    # cells collapse naturally under the assignment
+    angle_rad = np.deg2rad(angle)
+    t = np.linspace(-1.0, 1.0, kernel_size)
+    xs = np.rint(center + t * (center * np.cos(angle_rad))).astype(int)
+    ys = np.rint(center + t * (center * np.sin(angle_rad))).astype(int)
+    kernel[ys, xs] = 1.0
+
+    # Normalize the kernel
+    total = np.sum(kernel)
+    return kernel / total if total > 0 else kernel
 
 def apply_motion_blur(image, degree=12, angle=45):
     """
@@ -57,46 +101,21 @@ def apply_motion_blur(image, degree=12, angle=45):
                Other values: diagonal motion
         
     Returns:
-        Motion blurred image as float32 array
-        (Not converted to uint8 to allow for further processing)
-    
+        Motion blurred image, same dtype as the input
+
     Note:
         The function uses Bresenham's line algorithm to create the motion kernel
         The kernel size is automatically adjusted to be odd if necessary
     """
-    # Ensure we're working with float32 for processing
-    image_float = image.copy().astype(np.float32)
-    
-    # Convert angle to radians
-    angle_rad = np.deg2rad(angle)
-    
-    # Create the motion blur kernel
-    kernel_size = degree
-    if kernel_size % 2 == 0:
-        kernel_size += 1  # Ensure odd size
-    
-    kernel = np.zeros((kernel_size, kernel_size))
-    
-    # Calculate center point
-    center = kernel_size // 2
-    
-    # Create a line using Bresenham's algorithm
-    x_offset = int(center * np.cos(angle_rad))
-    y_offset = int(center * np.sin(angle_rad))
-    
-    # Draw the line on the kernel
-    cv2.line(kernel, 
-             (center - x_offset, center - y_offset), 
-             (center + x_offset, center + y_offset), 
-             1, thickness=1)
-    
-    # Normalize the kernel
-    kernel = kernel / np.sum(kernel) if np.sum(kernel) > 0 else kernel
-    
-    # Apply the filter
-    motion_blur = cv2.filter2D(image_float, -1, kernel)
-    
-    return motion_blur
+    # Fetch the cached kernel - quantizing the angle to whole degrees keeps
+    # the cache key space small without visible change in the streak
+    kernel = _motion_kernel(int(degree), int(angle))
+
+    # Apply the filter - cv2 operates on uint8 directly and preserves
+    # dtype; large frames go through the OpenCL backend when available
+    motion_blur = cv2.filter2D(maybe_umat(image), -1, kernel)
+
+    return to_ndarray(motion_blur)
 
 def apply_box_blur(image, kernel_size=5):
     """
@@ -115,25 +134,23 @@ def apply_box_blur(image, kernel_size=5):
                     Typical values: 3 (subtle), 5 (moderate), 9 (strong)
         
     Returns:
-        Blurred image as float32 array
-        (Not converted to uint8 to allow for further processing)
-    
+        Blurred image, same dtype as the input
+
     Note:
         If an even kernel size is provided, it will be incremented by 1 to ensure oddness
         The function preserves the original image dimensions and channels
         Box blur is computationally more efficient than Gaussian blur but less natural-looking
     """
-    # Ensure we're working with float32 for processing
-    image_float = image.copy().astype(np.float32)
-    
     # Ensure kernel size is odd
     if kernel_size % 2 == 0:
         kernel_size += 1
-    
-    # Create a box kernel
-    kernel = np.ones((kernel_size, kernel_size), np.float32) / (kernel_size * kernel_size)
-    
-    # Apply the filter
-    box_blur = cv2.filter2D(image_float, -1, kernel)
-    
-    return box_blur
\ No newline at end of file
+
+    # cv2.boxFilter normalizes internally and runs as an O(1)-per-pixel
+    # sliding sum, so no kernel array is built and the cost no longer
+    # grows with kernel size; it operates on uint8 directly and preserves
+    # dtype like the explicit filter2D it replaces; large frames go
+    # through the OpenCL backend when available
+    box_blur = cv2.boxFilter(maybe_umat(image), -1, (kernel_size, kernel_size),
+                             normalize=True)
+
+    return to_ndarray(box_blur)
\ No newline at end of file
@@ -1,6 +1,24 @@
+import random
+
 import numpy as np
 import cv2
 
+from ._opencl import maybe_umat, to_ndarray
+
+def _shake(image, dx, dy):
+    """Translate the frame by (dx, dy) pixels with replicated borders.
+
+    Shared core of the public shake functions - they differ only in how
+    the displacement is drawn. The scalar draws use the stdlib random
+    module, which is markedly faster than np.random for single values.
+    cv2 preserves the input dtype, and large frames go through the OpenCL
+    backend when available.
+    """
+    h, w = image.shape[:2]
+    M = np.float32([[1, 0, dx], [0, 1, dy]])
+    result = cv2.warpAffine(maybe_umat(image), M, (w, h), borderMode=cv2.BORDER_REPLICATE)
+    return to_ndarray(result)
+
 def simulate_shaky(image, intensity=10):
     """
     Simulate a shaky camera effect by applying random transformations in both directions.
@@ -20,23 +38,47 @@ def simulate_shaky(image, intensity=10):
     Note:
         Uses border replication to avoid black edges in the resulting image
     """
-    # Ensure we're working with float32 for processing
-    image_float = image.copy().astype(np.float32)
-    
-    # Get image dimensions
-    h, w = image_float.shape[:2]
-    
-    # Create random translation matrix
-    dx = np.random.randint(-intensity, intensity + 1)
-    dy = np.random.randint(-intensity, intensity + 1)
-    
-    # Create transformation matrix
-    M = np.float32([[1, 0, dx], [0, 1, dy]])
-    
-    # Apply affine transformation
-    result = cv2.warpAffine(image_float, M, (w, h), borderMode=cv2.BORDER_REPLICATE)
-    
-    return result
+    # Random displacement in both axes, applied by the shared warp core
+    dx = random.randint(-intensity, intensity)
+    dy = random.randint(-intensity, intensity)
+
+    return _shake(image, dx, dy)
+
+def simulate_combined_shake(image, intensity=10, direction='horizontal', directional_intensity=10):
+    """
+    Apply random and directional camera shake as a single fused warp.
+
+    Applying simulate_shaky followed by simulate_directional_shake warps the
+    full frame twice. Translations compose by adding their offsets, so this
+    function draws both displacements and applies them in one warpAffine,
+    halving the memory traffic of the shake stage. The edge replication is
+    applied once to the combined offset rather than per step, which is
+    visually indistinguishable for this effect.
+
+    Args:
+        image: Input image as numpy array (any format supported by OpenCV)
+        intensity: Intensity of the random shake (pixel displacement range)
+        direction: Direction of the directional component
+                   ('horizontal', 'vertical', or 'both')
+        directional_intensity: Intensity of the directional component
+
+    Returns:
+        Image with both shake effects applied (same type as input)
+
+    Note:
+        Uses border replication to avoid black edges in the resulting image
+    """
+    # Random component in both axes
+    dx = random.randint(-intensity, intensity)
+    dy = random.randint(-intensity, intensity)
+
+    # Directional component added on top
+    if direction in ('horizontal', 'both'):
+        dx += random.randint(-directional_intensity, directional_intensity)
+    if direction in ('vertical', 'both'):
+        dy += random.randint(-directional_intensity, directional_intensity)
+
+    return _shake(image, dx, dy)
 
 def simulate_directional_shake(image, direction='horizontal', intensity=10):
     """
@@ -62,27 +104,15 @@ def simulate_directional_shake(image, direction='horizontal', intensity=10):
     Note:
         Uses border replication to avoid black edges in the resulting image
     """
-    # Ensure we're working with float32 for processing
-    image_float = image.copy().astype(np.float32)
-    
-    # Get image dimensions
-    h, w = image_float.shape[:2]
-    
-    # Create random translation based on direction
+    # Random translation based on direction, applied by the shared warp core
     if direction == 'horizontal':
-        dx = np.random.randint(-intensity, intensity + 1)
+        dx = random.randint(-intensity, intensity)
         dy = 0
     elif direction == 'vertical':
         dx = 0
-        dy = np.random.randint(-intensity, intensity + 1)
+        dy = random.randint(-intensity, intensity)
     else:  # both
-        dx = np.random.randint(-intensity, intensity + 1)
-        dy = np.random.randint(-intensity, intensity + 1)
-    
-    # Create transformation matrix
-    M = np.float32([[1, 0, dx], [0, 1, dy]])
-    
-    # Apply affine transformation
-    result = cv2.warpAffine(image_float, M, (w, h), borderMode=cv2.BORDER_REPLICATE)
-    
-    return result
\ No newline at end of file
+        dx = random.randint(-intensity, intensity)
+        dy = random.randint(-intensity, intensity)
+
+    return _shake(image, dx, dy)
\ No newline at end of file